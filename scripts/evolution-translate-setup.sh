@@ -44,7 +44,7 @@ echo "Installing Python dependencies..."
 if [ -n "$REQ_PATH" ]; then
   "$VENV_DIR/bin/python" -m pip install -r "$REQ_PATH"
 else
-  "$VENV_DIR/bin/python" -m pip install argostranslate beautifulsoup4 langdetect
+  "$VENV_DIR/bin/python" -m pip install argostranslate beautifulsoup4 lxml langdetect
 fi
 
 MODELS_CHOICE=""
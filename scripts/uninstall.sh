@@ -39,6 +39,11 @@ else
     print_warning "Will proceed with manual removal"
 fi
 
+# Stop the translation daemon (it would otherwise keep running the removed code)
+if pkill -f "translate_runner.py --daemon" 2>/dev/null; then
+    print_status "Stopped translation daemon"
+fi
+
 # Manual removal (handles both multiarch paths and any stragglers)
 echo ""
 echo "Removing extension files manually (requires sudo)..."
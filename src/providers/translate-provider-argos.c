@@ -162,20 +162,22 @@ tp_argos_translate_async (gpointer              self,
 
     /* Preferred helper path order:
      * 1) TRANSLATE_HELPER_PATH (if set)
-     * 2) /usr/share/evolution-translate/translate/translate_runner.py (installed)
-     * 3) ~/.local/lib/evolution-translate/translate/translate_runner.py (developer)
+     * 2) /usr/share/evolution-translate/translate/translate_client.py (installed)
+     * 3) ~/.local/lib/evolution-translate/translate/translate_client.py (developer)
+     * translate_client.py forwards to a persistent translate_runner.py daemon
+     * (started on first use) so models are loaded once, not per message.
      */
     if (helper_env && *helper_env) {
         helper_path = helper_env;
     } else {
         /* Prefer new data install location (architecture-independent) */
-        helper_usr = g_build_filename ("/usr", "share", "evolution-translate", "translate", "translate_runner.py", NULL);
+        helper_usr = g_build_filename ("/usr", "share", "evolution-translate", "translate", "translate_client.py", NULL);
         if (g_file_test (helper_usr, G_FILE_TEST_EXISTS)) {
             helper_choice = g_steal_pointer (&helper_usr);
         } else {
             /* Developer/user-local location */
             const gchar *home = g_get_home_dir ();
-            helper_local = g_build_filename (home, ".local", "lib", "evolution-translate", "translate", "translate_runner.py", NULL);
+            helper_local = g_build_filename (home, ".local", "lib", "evolution-translate", "translate", "translate_client.py", NULL);
             if (g_file_test (helper_local, G_FILE_TEST_EXISTS)) {
                 helper_choice = g_steal_pointer (&helper_local);
             }
@@ -7,8 +7,91 @@ This module provides centralized GPU detection and configuration logic
 to avoid code duplication across translation scripts.
 """
 
+import glob
+import json
 import os
 import sys
+import time
+
+# Present only when the NVIDIA kernel driver is loaded
+NVIDIA_DRIVER_PROC = "/proc/driver/nvidia/version"
+NVIDIA_PCI_VENDOR = "0x10de"
+
+# Result of the last torch probe, reused for a day to skip the CUDA driver init
+DEVICE_CACHE_FILE = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"),
+                                 "evolution-translate", "device.json")
+DEVICE_CACHE_MAX_AGE = 24 * 60 * 60  # seconds
+
+
+def _device_cache_key() -> dict:
+    """Describe the hardware/environment a cached device decision is valid for."""
+    nvidia_pci = False
+    for vendor_file in glob.glob("/sys/bus/pci/devices/*/vendor"):
+        try:
+            with open(vendor_file) as f:
+                if f.read().strip() == NVIDIA_PCI_VENDOR:
+                    nvidia_pci = True
+                    break
+        except OSError:
+            continue
+    return {"nvidia_pci": nvidia_pci, "cuda_visible_devices": os.environ.get("CUDA_VISIBLE_DEVICES")}
+
+
+def _read_cached_device(key: dict):
+    """Return the cached device type if fresh and recorded for the same key, else None."""
+    try:
+        if time.time() - os.path.getmtime(DEVICE_CACHE_FILE) > DEVICE_CACHE_MAX_AGE:
+            return None
+        with open(DEVICE_CACHE_FILE) as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(cached, dict) or cached.get("key") != key:
+        return None
+    return cached.get("device_type")
+
+
+def _write_cached_device(key: dict, device_type: str) -> None:
+    """Persist the probed device type; failures are ignored (cache is best-effort)."""
+    try:
+        os.makedirs(os.path.dirname(DEVICE_CACHE_FILE), exist_ok=True)
+        with open(DEVICE_CACHE_FILE, "w") as f:
+            json.dump({"key": key, "device_type": device_type}, f)
+    except OSError:
+        pass
+
+
+def get_cuda_device_index(device_count=None, debug_log_func=None):
+    """
+    Parse TRANSLATE_CUDA_DEVICE ("1" or "0,1") into the GPU indices to load models on.
+
+    Args:
+        device_count: Number of visible CUDA devices, used to reject invalid indices
+        debug_log_func: Optional function for debug logging
+
+    Returns:
+        list[int] of device indices, or None to use CTranslate2's default (GPU 0)
+    """
+    value = os.environ.get("TRANSLATE_CUDA_DEVICE", "").strip()
+    if not value:
+        return None
+
+    try:
+        indices = [int(part) for part in value.split(",") if part.strip()]
+    except ValueError:
+        indices = []
+    if not indices or min(indices) < 0:
+        print(f"[translate] Ignoring invalid TRANSLATE_CUDA_DEVICE={value}", file=sys.stderr)
+        return None
+
+    if device_count is not None and max(indices) >= device_count:
+        print(f"[translate] Ignoring TRANSLATE_CUDA_DEVICE={value} "
+              f"(only {device_count} CUDA device(s) visible)", file=sys.stderr)
+        return None
+
+    if debug_log_func:
+        debug_log_func(f"GPU config: Using CUDA device index {indices}")
+    return indices
 
 
 def setup_gpu_acceleration(debug_log_func=None):
@@ -16,11 +99,15 @@ def setup_gpu_acceleration(debug_log_func=None):
     Configure GPU acceleration for argostranslate.
     Sets ARGOS_DEVICE_TYPE to 'cuda' if GPU is available, otherwise 'cpu'.
 
+    A user-defined ARGOS_DEVICE_TYPE is respected; 'cuda:N' selects GPU N
+    (forwarded as TRANSLATE_CUDA_DEVICE, since Argos only understands 'cuda'),
+    and 'auto' lets CTranslate2 pick CUDA when usable and CPU otherwise.
+
     Args:
         debug_log_func: Optional function for debug logging (e.g., debug_log from translate_runner)
 
     Returns:
-        str: The device type that was configured ('cuda' or 'cpu')
+        str: The device type that was configured ('cuda', 'cpu' or a user-defined value)
     """
     # Helper for optional debug logging
     def log(msg):
@@ -28,12 +115,36 @@ def setup_gpu_acceleration(debug_log_func=None):
             debug_log_func(msg)
 
     # Only set if not already configured by user
+    user_device = os.environ.get("ARGOS_DEVICE_TYPE", "")
+    if user_device.startswith("cuda:"):
+        os.environ["ARGOS_DEVICE_TYPE"] = "cuda"
+        os.environ["TRANSLATE_CUDA_DEVICE"] = user_device[len("cuda:"):]
+        log(f"GPU config: Split ARGOS_DEVICE_TYPE={user_device} into cuda + "
+            f"TRANSLATE_CUDA_DEVICE={os.environ['TRANSLATE_CUDA_DEVICE']}")
     if "ARGOS_DEVICE_TYPE" in os.environ:
         log(f"GPU config: Using user-defined ARGOS_DEVICE_TYPE={os.environ['ARGOS_DEVICE_TYPE']}")
         return os.environ["ARGOS_DEVICE_TYPE"]
 
     device_type = "cpu"  # Default fallback
 
+    # Cheap probe first: without the NVIDIA driver CUDA cannot be available,
+    # so skip importing torch (slow, hundreds of MB) altogether
+    if sys.platform.startswith("linux") and not os.path.exists(NVIDIA_DRIVER_PROC):
+        print("[translate] Using CPU (no NVIDIA driver loaded)", file=sys.stderr)
+        log("GPU config: Using CPU (no NVIDIA driver loaded)")
+        os.environ["ARGOS_DEVICE_TYPE"] = device_type
+        log(f"GPU config: Set ARGOS_DEVICE_TYPE={device_type}")
+        return device_type
+
+    # Reuse a recent probe result for the same hardware and CUDA_VISIBLE_DEVICES
+    cache_key = _device_cache_key()
+    cached_device = _read_cached_device(cache_key)
+    if cached_device in ("cuda", "cpu"):
+        log(f"GPU config: Using cached device decision from {DEVICE_CACHE_FILE}")
+        os.environ["ARGOS_DEVICE_TYPE"] = cached_device
+        log(f"GPU config: Set ARGOS_DEVICE_TYPE={cached_device}")
+        return cached_device
+
     try:
         import torch
         if torch.cuda.is_available():
@@ -45,6 +156,7 @@ def setup_gpu_acceleration(debug_log_func=None):
             msg = "[translate] Using CPU (no CUDA device found)"
             print(msg, file=sys.stderr)
             log("GPU config: Using CPU (no CUDA device found)")
+        _write_cached_device(cache_key, device_type)
     except ImportError:
         # PyTorch not installed, fall back to CPU
         msg = "[translate] Using CPU (PyTorch not available for GPU detection)"
@@ -7,6 +7,8 @@ Supports: Dutch (nl), Spanish (es), French (fr), German (de), Italian (it), Port
 
 import os
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Import shared GPU utilities
 from gpu_utils import setup_gpu_acceleration
@@ -14,6 +16,9 @@ from gpu_utils import setup_gpu_acceleration
 # Set up GPU acceleration before importing argostranslate
 setup_gpu_acceleration()
 
+# Number of model downloads running in parallel
+DOWNLOAD_WORKERS = 4
+
 def install_default_models():
     """Install default translation models for major languages to English."""
     try:
@@ -49,33 +54,52 @@ def install_default_models():
     available_packages = pkg.get_available_packages()
     installed_count = 0
 
+    # Index packages once so each language is an O(1) lookup
+    available_by_pair = {(p.from_code, p.to_code): p for p in available_packages if p.type == "translate"}
+    installed_pairs = {(p.from_code, p.to_code) for p in pkg.get_installed_packages()}
+
+    # Resolve which packages need installing before downloading anything
+    to_install = []
     for from_code, to_code, language_name in default_languages:
         print(f"\n[{language_name}] Checking {from_code} → {to_code}...")
 
         # Check if already installed
-        installed = pkg.get_installed_packages()
-        if any(p.from_code == from_code and p.to_code == to_code for p in installed):
+        if (from_code, to_code) in installed_pairs:
             print(f"  ✓ Already installed")
             continue
 
-        # Find and install the package
-        found = False
-        for p in available_packages:
-            if p.type == "translate" and p.from_code == from_code and p.to_code == to_code:
-                found = True
-                print(f"  Downloading...")
-                try:
-                    download_path = p.download()
-                    print(f"  Installing...")
-                    pkg.install_from_path(download_path)
-                    print(f"  ✓ Successfully installed {from_code} → {to_code}")
-                    installed_count += 1
-                except Exception as e:
-                    print(f"  ✗ Failed to install: {e}")
-                break
-
-        if not found:
+        # Find the package
+        p = available_by_pair.get((from_code, to_code))
+        if p is None:
             print(f"  ✗ Package not found in repository")
+            continue
+
+        to_install.append((p, language_name))
+        print(f"  Queued for download")
+
+    if to_install:
+        print(f"\nDownloading {len(to_install)} models ({DOWNLOAD_WORKERS} at a time)...")
+
+    # Downloads are network-bound, so run them concurrently; installing
+    # extracts into the shared packages directory, so serialize that part
+    install_lock = threading.Lock()
+
+    def download_and_install(p):
+        download_path = p.download()
+        with install_lock:
+            pkg.install_from_path(download_path)
+
+    with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as executor:
+        futures = {executor.submit(download_and_install, p): (p, language_name)
+                   for p, language_name in to_install}
+        for future in as_completed(futures):
+            p, language_name = futures[future]
+            try:
+                future.result()
+                print(f"  ✓ [{language_name}] Successfully installed {p.from_code} → {p.to_code}")
+                installed_count += 1
+            except Exception as e:
+                print(f"  ✗ [{language_name}] Failed to install: {e}")
 
     print(f"\n{'='*60}")
     print(f"Installation complete! Installed {installed_count} new models.")
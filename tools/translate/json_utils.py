@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+json_utils.py
+Shared JSON output helpers for the translation runners and client.
+"""
+
+import io
+import json
+import sys
+
+# orjson (optional) serializes large translated HTML much faster and emits
+# UTF-8 bytes directly; stdlib json is the fallback
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps_json(obj) -> bytes:
+    """Serialize obj to UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode("utf-8")
+
+
+def write_json(result: dict) -> None:
+    """
+    Write result to stdout as UTF-8 JSON.
+
+    Uses orjson when installed. Otherwise the JSON is streamed into stdout's
+    buffer instead of being built as one more full copy of the (possibly
+    large) translated HTML. Either way non-ASCII text is written as-is rather
+    than as \\uXXXX escapes.
+    """
+    if orjson is not None:
+        sys.stdout.buffer.write(orjson.dumps(result, option=orjson.OPT_APPEND_NEWLINE))
+        sys.stdout.flush()
+        return
+
+    out = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", write_through=False)
+    try:
+        json.dump(result, out, ensure_ascii=False)
+        out.write("\n")
+        out.flush()
+    finally:
+        out.detach()  # Leave sys.stdout usable
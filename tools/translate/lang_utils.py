@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+lang_utils.py
+Shared language checks for the offline and online translation runners.
+
+Kept free of heavy imports so either runner can use it without loading
+the other.
+"""
+
+import os
+import re
+
+# Characters of (whitespace-collapsed) text handed to the language detector;
+# detection converges long before this, and its cost grows with input length
+try:
+    DETECTION_SAMPLE_CHARS = max(1, int(os.environ.get("TRANSLATE_DETECT_SAMPLE_BYTES", "2048")))
+except ValueError:
+    DETECTION_SAMPLE_CHARS = 2048
+
+# English fast path: text that uses "the" plus several other function words
+# found in no other supported language, above the given share of all words, is
+# treated as English without running langdetect ("is", "to", "of", "was",
+# "will" are left out: they are everyday Dutch/German words too)
+ENGLISH_SAMPLE_CHARS = 4000
+ENGLISH_MIN_WORDS = 20
+ENGLISH_MIN_DISTINCT_STOPWORDS = 4
+ENGLISH_STOPWORD_RATIO = 0.08
+_ENGLISH_STOPWORDS_RE = re.compile(
+    r"\b(the|and|you|your|with|that|this|have|from|would|which|there|been|they|what|about)\b"
+)
+
+
+def looks_like_english(text: str) -> bool:
+    """
+    Cheap check for text that is clearly English already (no langdetect needed).
+
+    Requires mostly-ASCII text that contains "the" and several other
+    English-only function words, making up a share of the words no other
+    language reaches; anything doubtful returns False and goes through regular
+    language detection.
+    """
+    sample = text[:ENGLISH_SAMPLE_CHARS].lower()
+    if not sample:
+        return False
+    if sum(1 for c in sample if c.isascii()) / len(sample) < 0.95:
+        return False
+    words = len(sample.split())
+    if words < ENGLISH_MIN_WORDS:
+        return False
+    found = _ENGLISH_STOPWORDS_RE.findall(sample)
+    distinct = set(found)
+    if "the" not in distinct or len(distinct) < ENGLISH_MIN_DISTINCT_STOPWORDS:
+        return False
+    return len(found) / words > ENGLISH_STOPWORD_RATIO
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""Regression tests for translate_runner (no models needed)."""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+TOOLS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, TOOLS_DIR)
+
+import lang_utils
+import translate_client
+import translate_runner
+
+
+class _UpperTranslator:
+    def translate(self, s: str) -> str:
+        return s.upper()
+
+
+class TextSpanScannerTests(unittest.TestCase):
+    def test_offsets_after_trailing_ampersand(self):
+        html_content = "<div>Hello team,</div><div>Best regards from AT&T"
+        spans = translate_runner.scan_text_spans(html_content)
+        self.assertEqual([html_content[s:e] for s, e, _ in spans],
+                         ["Hello team,", "Best regards from AT&T"])
+        result = translate_runner.translate_html_carefully(_UpperTranslator(), html_content)
+        self.assertEqual(result, "<div>HELLO TEAM,</div><div>BEST REGARDS FROM AT&amp;T")
+
+    def test_truncated_tag_is_left_alone(self):
+        html_content = "<p>Meeting notes</p><p>Budget is fine</p><p"
+        spans = translate_runner.scan_text_spans(html_content)
+        self.assertEqual([data for _, _, data in spans], ["Meeting notes", "Budget is fine"])
+        result = translate_runner.translate_html_carefully(_UpperTranslator(), html_content)
+        self.assertEqual(result, "<p>MEETING NOTES</p><p>BUDGET IS FINE</p><p")
+
+    def test_unterminated_comment_is_left_alone(self):
+        html_content = "<p>Hello there</p><!-- internal note"
+        result = translate_runner.translate_html_carefully(_UpperTranslator(), html_content)
+        self.assertEqual(result, "<p>HELLO THERE</p><!-- internal note")
+
+
+class LooksLikeEnglishTests(unittest.TestCase):
+    def test_english_email(self):
+        text = ("Hi team, thanks for your message. The meeting tomorrow has been moved to "
+                "Thursday at ten. Please let me know if that works for you and whether you "
+                "need anything from me before then. The report is attached. Best regards, John")
+        self.assertTrue(lang_utils.looks_like_english(text))
+
+    def test_dutch_email(self):
+        text = ("Beste Jan, bedankt voor je bericht. De vergadering van morgen is verplaatst "
+                "naar donderdag om tien uur. Laat me weten of dat voor jou past en of je nog "
+                "iets van mij nodig hebt. Het verslag is bijgevoegd. Met vriendelijke groet, Piet")
+        self.assertFalse(lang_utils.looks_like_english(text))
+
+    def test_german_email(self):
+        text = ("Hallo Jan, danke für deine Nachricht. Das Treffen morgen ist auf Donnerstag "
+                "um zehn Uhr verschoben. Gib mir Bescheid, ob das für dich passt und ob du noch "
+                "etwas von mir brauchst. Der Bericht ist im Anhang. Viele Grüße, Peter")
+        self.assertFalse(lang_utils.looks_like_english(text))
+
+    def test_french_email(self):
+        text = ("Bonjour Jean, merci pour ton message. La réunion de demain est reportée à "
+                "jeudi à dix heures. Dis-moi si cela te convient et si tu as besoin de quelque "
+                "chose de ma part. Le rapport est en pièce jointe. Cordialement, Pierre")
+        self.assertFalse(lang_utils.looks_like_english(text))
+
+    def test_spanish_email(self):
+        text = ("Hola Juan, gracias por tu mensaje. La reunión de mañana se ha movido al jueves "
+                "a las diez. Avísame si te viene bien y si necesitas algo de mi parte. El informe "
+                "está adjunto. Saludos cordiales, Pedro")
+        self.assertFalse(lang_utils.looks_like_english(text))
+
+
+class DaemonHandshakeTests(unittest.TestCase):
+    """Runs a real daemon in fake mode (TRANSLATE_FAKE_UPPERCASE=1) on a temporary socket."""
+
+    def setUp(self):
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp)
+        self.socket_path = os.path.join(tmp, "daemon.sock")
+        self.env = dict(os.environ, TRANSLATE_FAKE_UPPERCASE="1")
+        self.env.pop("TRANSLATE_NO_DAEMON", None)
+
+    def config(self, **env):
+        with mock.patch.dict(os.environ, dict(self.env, **env), clear=True):
+            return translate_runner.daemon_config()
+
+    def request(self, text, **env):
+        return translate_client.request_daemon(self.socket_path, {"text": text, "config": self.config(**env)})
+
+    def wait_for_socket(self, present: bool):
+        deadline = time.monotonic() + 10
+        while os.path.exists(self.socket_path) != present:
+            self.assertLess(time.monotonic(), deadline, "daemon did not come up / go away")
+            time.sleep(0.05)
+
+    def start_daemon(self):
+        daemon = subprocess.Popen([sys.executable, os.path.join(TOOLS_DIR, "translate_runner.py"),
+                                   "--daemon", "--socket", self.socket_path],
+                                  env=self.env, stderr=subprocess.DEVNULL)
+        self.addCleanup(daemon.wait, 10)
+        self.addCleanup(daemon.kill)
+        self.wait_for_socket(True)
+        return daemon
+
+    def test_matching_config_is_served(self):
+        self.start_daemon()
+        self.assertEqual(self.request("hallo"), {"translated": "HALLO"})
+
+    def test_stale_daemon_exits_and_client_starts_a_replacement(self):
+        daemon = self.start_daemon()
+        self.assertIsNone(self.request("hallo", TRANSLATE_COMPUTE_TYPE="int8"))
+        self.assertEqual(daemon.wait(10), 0)
+
+        # The client translates in-process and starts a daemon with its own settings
+        client = subprocess.run([sys.executable, os.path.join(TOOLS_DIR, "translate_client.py"),
+                                 "--socket", self.socket_path, "--text"],
+                                input=b"hallo", stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                env=dict(self.env, TRANSLATE_COMPUTE_TYPE="int8"), check=True)
+        self.assertEqual(json.loads(client.stdout), {"translated": "HALLO"})
+        self.wait_for_socket(True)
+        self.addCleanup(self.request, "stop")  # Retires the replacement (its config differs)
+        self.assertEqual(self.request("wereld", TRANSLATE_COMPUTE_TYPE="int8"), {"translated": "WERELD"})
+
+
+if __name__ == "__main__":
+    unittest.main()
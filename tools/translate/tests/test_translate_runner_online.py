@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""Tests for translate_runner_online's request packing and caching (no network needed)."""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import translate_runner_online as online
+
+
+class _StubTranslator:
+    """Upper-cases text in place of a provider and records every request."""
+
+    source = "nl"
+    target = "en"
+
+    def __init__(self, keep_separators: bool = True):
+        self.keep_separators = keep_separators
+        self.requests = []
+
+    def __deepcopy__(self, memo):
+        return self  # Worker threads share the request log
+
+    def translate(self, text: str) -> str:
+        self.requests.append(text)
+        if not self.keep_separators:
+            text = text.replace("@@@SEP@@@", " ")
+        return text.upper()
+
+
+class _StubTestCase(unittest.TestCase):
+    def setUp(self):
+        # No throttling of the stub; no disk cache unless a test opens one
+        patches = [
+            mock.patch.dict(online.PROVIDER_RATES, {"_StubTranslator": 1000}),
+            mock.patch.dict(os.environ, {"TRANSLATE_DISK_CACHE": "0"}),
+            mock.patch.object(online, "_DISK_CACHE", None),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+
+class BulkTranslateTests(_StubTestCase):
+    def test_splits_translation_on_separators(self):
+        translator = _StubTranslator()
+        self.assertEqual(online._bulk_translate(translator, ["een", "twee", "drie"]),
+                         ["EEN", "TWEE", "DRIE"])
+        self.assertEqual(len(translator.requests), 1)
+
+    def test_accepts_separators_with_changed_spacing(self):
+        translator = _StubTranslator()
+        translator.translate = lambda text: "ONE\n@ @ @ Sep @ @ @\nTWO"
+        self.assertEqual(online._bulk_translate(translator, ["een", "twee"]), ["ONE", "TWO"])
+
+    def test_lost_separators_return_none(self):
+        translator = _StubTranslator(keep_separators=False)
+        self.assertIsNone(online._bulk_translate(translator, ["een", "twee", "drie"]))
+
+    def test_lost_separators_fall_back_to_one_request_per_string(self):
+        translator = _StubTranslator(keep_separators=False)
+        texts = ["een", "twee", "drie"]
+        results = [None] * len(texts)
+        online._translate_uncached(translator, texts, results)
+        self.assertEqual(results, ["EEN", "TWEE", "DRIE"])
+        self.assertEqual(len(translator.requests), 1 + len(texts))
+
+
+class BulkGroupsTests(unittest.TestCase):
+    def test_groups_stay_within_char_limit(self):
+        texts = ["x" * n for n in (10, 40, 25, 5, 60, 30, 15)]
+        groups = list(online._bulk_groups(texts, 100))
+        self.assertEqual([i for group in groups for i in group], list(range(len(texts))))
+        for group in groups:
+            self.assertLessEqual(sum(len(texts[i]) + len(online.BULK_SEPARATOR) for i in group), 100)
+
+    def test_groups_hold_at_most_batch_size_strings(self):
+        groups = list(online._bulk_groups(["a"] * (online.BATCH_SIZE * 2 + 1), 10 ** 9))
+        self.assertEqual([len(group) for group in groups], [online.BATCH_SIZE, online.BATCH_SIZE, 1])
+
+    def test_oversized_string_gets_its_own_group(self):
+        groups = list(online._bulk_groups(["a", "b" * 500, "c"], 100))
+        self.assertEqual(groups, [[0], [1], [2]])
+
+
+class TranslateTextsTests(_StubTestCase):
+    def setUp(self):
+        super().setUp()
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+        patch = mock.patch.object(online, "DISK_CACHE_FILE", os.path.join(cache_dir, "cache.db"))
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def _open_cache(self):
+        os.environ["TRANSLATE_DISK_CACHE"] = "1"  # Restored by the patch in setUp
+        self.addCleanup(lambda: online._DISK_CACHE and online._DISK_CACHE.close())
+
+    def test_duplicates_are_sent_once(self):
+        translator = _StubTranslator()
+        self.assertEqual(online.translate_texts(translator, ["hallo", "wereld", "hallo"]),
+                         ["HALLO", "WERELD", "HALLO"])
+        sent = "".join(translator.requests)
+        self.assertEqual(sent.count("hallo"), 1)
+        self.assertEqual(sent.count("wereld"), 1)
+
+    def test_cached_strings_are_not_sent_again(self):
+        self._open_cache()
+        online.translate_texts(_StubTranslator(), ["hallo", "wereld"])
+
+        translator = _StubTranslator()
+        self.assertEqual(online.translate_texts(translator, ["wereld", "tot ziens", "hallo"]),
+                         ["WERELD", "TOT ZIENS", "HALLO"])
+        self.assertEqual(translator.requests, ["tot ziens"])
+
+    def test_cache_is_per_provider_language_pair(self):
+        self._open_cache()
+        online.translate_texts(_StubTranslator(), ["hallo"])
+
+        translator = _StubTranslator()
+        translator.target = "de"
+        online.translate_texts(translator, ["hallo"])
+        self.assertEqual(translator.requests, ["hallo"])
+
+    def test_nothing_is_cached_when_disabled(self):
+        online.translate_texts(_StubTranslator(), ["hallo"])
+
+        translator = _StubTranslator()
+        online.translate_texts(translator, ["hallo"])
+        self.assertEqual(translator.requests, ["hallo"])
+
+
+class LongTextTests(_StubTestCase):
+    TEXT = ("  Beste Jan,\n\nDe vergadering van morgen is verplaatst naar donderdag. "
+            "Het verslag is bijgevoegd!   Laat je weten of dat past?\n\n\n"
+            + "woord " * 40 + "\nMet vriendelijke groet,\nPiet  \n")
+
+    def test_pack_gives_back_the_text_in_pieces_within_limit(self):
+        for limit in (20, 50, 120, len(self.TEXT)):
+            pieces = online._pack(self.TEXT, limit)
+            self.assertEqual("".join(pieces), self.TEXT)
+            self.assertTrue(all(0 < len(piece) <= limit for piece in pieces), limit)
+
+    def test_pack_cuts_at_sentence_ends(self):
+        pieces = online._pack("Een zin. Nog een zin. En de laatste.", 20)
+        self.assertEqual(pieces, ["Een zin. ", "Nog een zin. ", "En de laatste."])
+
+    def test_long_text_keeps_whitespace_around_chunks(self):
+        translator = _StubTranslator()
+        with mock.patch.dict(online.BULK_CHAR_LIMITS, {"_StubTranslator": 80}):
+            self.assertEqual(online.translate_long_text(translator, self.TEXT), self.TEXT.upper())
+        # Edge whitespace is restored locally, never sent to the provider
+        self.assertTrue(all(request == request.strip() for request in translator.requests))
+        self.assertGreater(len(translator.requests), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
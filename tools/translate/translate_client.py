@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+translate_client.py
+Thin client for the translate_runner.py daemon. Accepts the same options as
+translate_runner.py, reads text from stdin and writes the JSON response to
+stdout. Options:
+  --target <lang>  target ISO 639-1 (default: en)
+  --html | --text  hint whether input is HTML (best-effort)
+  --install-on-demand | --no-install-on-demand  enable/disable auto-download of models
+  --debug          enable debug logging to /tmp/translate_debug.log
+  --socket <path>  daemon socket path (default: $XDG_RUNTIME_DIR/evolution-translate.sock,
+                   or /tmp/evolution-translate-<uid>/evolution-translate.sock without it)
+
+If the daemon is not running, it is started in the background for the next
+request and the current request is translated in-process, so the first email
+costs the same as a direct translate_runner.py call and later ones reuse the
+already-loaded models. Set TRANSLATE_NO_DAEMON=1 to never start the daemon.
+A daemon started under other settings (device, compute type, ...) or from an
+older install exits when asked and is replaced the same way; an idle daemon
+exits after TRANSLATE_DAEMON_IDLE_TIMEOUT seconds (default 900).
+"""
+
+import argparse
+import json
+import os
+import socket
+import struct
+import subprocess
+import sys
+
+import translate_runner
+from json_utils import dumps_json
+from translate_runner import DEFAULT_SOCKET_PATH, daemon_config
+
+RUNNER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "translate_runner.py")
+
+
+def peer_is_current_user(sock) -> bool:
+    """Return True if the process listening on the connected Unix socket runs as this user."""
+    if not hasattr(socket, "SO_PEERCRED"):
+        return False  # Cannot tell (not Linux): do not hand it the email
+    creds = sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+    _, uid, _ = struct.unpack("3i", creds)
+    return uid == os.getuid()
+
+
+def request_daemon(socket_path: str, request: dict):
+    """
+    Send one request to the daemon and wait for its response.
+
+    Args:
+        socket_path: Filesystem path of the daemon's Unix socket
+        request: JSON-serializable request payload
+
+    Returns:
+        The decoded response dict, or None if the daemon is unreachable, runs
+        as another user, or was started under a different configuration (it
+        then exits).
+    """
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(socket_path)
+            if not peer_is_current_user(sock):
+                print(f"[translate] Ignoring {socket_path}: not served by this user", file=sys.stderr)
+                return None
+            sock.sendall(dumps_json(request) + b"\n")
+            with sock.makefile("rb") as reader:
+                line = reader.readline()
+    except OSError:
+        return None
+
+    if not line:
+        return None
+    try:
+        response = json.loads(line)
+    except ValueError:
+        return None
+    if response.get("stale"):
+        return None
+    return response
+
+
+def spawn_daemon(socket_path: str, debug: bool = False) -> None:
+    """Start translate_runner.py in daemon mode, detached from this process."""
+    argv = [sys.executable, RUNNER_PATH, "--daemon", "--socket", socket_path]
+    if debug:
+        argv.append("--debug")
+    try:
+        subprocess.Popen(argv, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                         stderr=subprocess.DEVNULL, start_new_session=True)
+    except OSError as e:
+        print(f"[translate] Failed to start daemon: {e}", file=sys.stderr)
+
+
+def main() -> int:
+    """Main entry point for the translation client."""
+    ap = argparse.ArgumentParser(description="Client for the offline translation daemon")
+    ap.add_argument("--target", default="en", help="Target language (ISO 639-1 code, default: en)")
+    ap.add_argument("--html", dest="is_html", action="store_true", help="Input is HTML")
+    ap.add_argument("--text", dest="is_html", action="store_false", help="Input is plain text (default)")
+    ap.add_argument("--install-on-demand", dest="install_on_demand", action="store_true", default=True,
+                    help="Enable automatic download of missing models (default)")
+    ap.add_argument("--no-install-on-demand", dest="install_on_demand", action="store_false",
+                    help="Disable automatic download of missing models")
+    ap.add_argument("--debug", action="store_true", help="Enable debug logging")
+    ap.add_argument("--socket", default=DEFAULT_SOCKET_PATH,
+                    help=f"Daemon socket path (default: {DEFAULT_SOCKET_PATH})")
+    args = ap.parse_args()
+
+    data = translate_runner.read_stdin()
+
+    response = request_daemon(args.socket, {
+        "text": data,
+        "target": args.target,
+        "is_html": args.is_html,
+        "install_on_demand": args.install_on_demand,
+        "config": daemon_config(),
+    })
+
+    if response is None:
+        # Daemon not running: start it for next time and translate directly now
+        if os.environ.get("TRANSLATE_NO_DAEMON") != "1":
+            spawn_daemon(args.socket, args.debug)
+
+        if args.debug:
+            translate_runner.enable_debug_logging()
+        try:
+            out = translate_runner.translate_offline(data, args.target, args.is_html, args.install_on_demand)
+        except Exception as e:
+            print(f"[translate] ERROR: Unexpected exception: {e}", file=sys.stderr)
+            out = data
+        response = {"translated": out}
+
+    sys.stdout.buffer.write(dumps_json(response))
+    sys.stdout.flush()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
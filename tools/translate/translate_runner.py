@@ -7,6 +7,9 @@ plain text to stdout. Options:
   --html | --text  hint whether input is HTML (best-effort)
   --install-on-demand | --no-install-on-demand  enable/disable auto-download of models
   --debug          enable debug logging to /tmp/translate_debug.log
+  --daemon         serve newline-delimited JSON requests on a Unix socket
+  --socket <path>  socket path for --daemon (default: $XDG_RUNTIME_DIR/evolution-translate.sock,
+                   or /tmp/evolution-translate-<uid>/evolution-translate.sock without it)
 
 If argostranslate/translate_html/langdetect are unavailable or models are
 missing, falls back to a no-op (echo) translation, so the pipeline works.
@@ -14,27 +17,143 @@ missing, falls back to a no-op (echo) translation, so the pipeline works.
 
 import argparse
 import os
+import re
+import stat
 import sys
 import json
+import threading
+import time
+from collections import OrderedDict
+from html import escape as html_escape
+from html.parser import HTMLParser
+
+from json_utils import dumps_json
+from lang_utils import DETECTION_SAMPLE_CHARS, ENGLISH_SAMPLE_CHARS, looks_like_english
 
 # Debug logging support
 DEBUG_MODE = False
 DEBUG_LOG_FILE = "/tmp/translate_debug.log"
 
-def debug_log(msg):
-    """Log debug message if debug mode is enabled"""
-    if DEBUG_MODE:
+# Daemon mode: default socket location. Without a per-user runtime dir, use a
+# private (0700) directory in /tmp rather than a path any user could take first
+SOCKET_FALLBACK_DIR = f"/tmp/evolution-translate-{os.getuid()}"
+DEFAULT_SOCKET_PATH = os.path.join(os.environ.get("XDG_RUNTIME_DIR") or SOCKET_FALLBACK_DIR,
+                                   "evolution-translate.sock")
+
+# Settings the daemon takes from its environment at startup; a client with
+# different values is not served by it (see daemon_config)
+DAEMON_ENV_KEYS = ("ARGOS_DEVICE_TYPE", "TRANSLATE_CUDA_DEVICE", "CUDA_VISIBLE_DEVICES",
+                   "TRANSLATE_COMPUTE_TYPE", "TRANSLATE_DAEMON_WORKERS",
+                   "TRANSLATE_DETECT_SAMPLE_BYTES", "TRANSLATE_FAKE_UPPERCASE")
+# Modules the daemon runs; replacing any of them (an upgrade) retires it
+DAEMON_MODULES = ("translate_runner.py", "lang_utils.py", "json_utils.py", "gpu_utils.py")
+
+# Daemon exits after this long without requests, releasing model memory
+try:
+    DAEMON_IDLE_TIMEOUT = max(0, int(os.environ.get("TRANSLATE_DAEMON_IDLE_TIMEOUT", "900")))
+except ValueError:
+    DAEMON_IDLE_TIMEOUT = 900
+
+# Reuse Argos' downloaded package index for this long before refreshing it
+PACKAGE_INDEX_MAX_AGE = 6 * 60 * 60  # seconds
+
+# Raw read size when slurping stdin
+STDIN_CHUNK_SIZE = 64 * 1024
+
+# Batched CTranslate2 translation of HTML text nodes (mirrors Argos' own settings)
+BATCH_SIZE = 32
+BATCH_MAX_CHARS = 250  # Longer nodes go through Argos so sentence splitting applies
+
+# CTranslate2 compute type for offline models. "auto" quantizes weights to int8
+# when loading (int8_float16 on CUDA): ~4x less memory than float32 and faster
+# int8 kernels on CPU, for a small quality cost. "default" keeps the stored type.
+COMPUTE_TYPE = os.environ.get("TRANSLATE_COMPUTE_TYPE", "auto")
+
+# Concurrent requests served by the daemon; they share one copy of each model
+# (CTranslate2 runs up to this many translations on it in parallel)
+try:
+    DAEMON_WORKERS = max(1, int(os.environ.get("TRANSLATE_DAEMON_WORKERS", "2")))
+except ValueError:
+    DAEMON_WORKERS = 2
+
+# Loaded translators keyed by (from_code, to_code), reused across daemon requests
+_TRANSLATORS = {}
+# Installed Argos languages keyed by code (see installed_languages_by_code)
+_LANGUAGES_BY_CODE = None
+# One lock per language pair (created under _LOAD_LOCKS_LOCK): concurrent daemon
+# requests never load a model twice, and only requests for a pair that is
+# still loading or downloading wait for it
+_LOAD_LOCKS = {}
+_LOAD_LOCKS_LOCK = threading.Lock()
+# Pairs may download in parallel, but Argos rewrites one shared package index
+_INDEX_LOCK = threading.Lock()
+# langdetect's detect(), imported on first use (False once known unavailable)
+_DETECT = None
+
+# Recently translated strings keyed by (translator, text); repeated boilerplate
+# ("Unsubscribe", "Sent from my iPhone") skips the model entirely
+TEXT_CACHE_SIZE = 4096
+_TEXT_CACHE = OrderedDict()
+_TEXT_CACHE_LOCK = threading.Lock()
+
+# Text made only of digits, whitespace and symbols is not worth translating
+_SKIP_RE = re.compile(r'^[\d\s\W]+\Z')
+# ASCII characters matched by _SKIP_RE, for a regex-free check on ASCII text
+_SKIP_ASCII_CHARS = frozenset(c for c in map(chr, range(128)) if _SKIP_RE.match(c))
+
+# Text inside these elements is never translated
+SKIP_TEXT_TAGS = frozenset({"script", "style", "pre"})
+
+_DEBUG_LOG_HANDLE = None
+
+
+def _noop_debug_log(msg, *args):
+    """Debug logging disabled: discard the message without formatting it"""
+
+
+def _file_debug_log(msg, *args):
+    """Append a debug message (%-formatted with args, like logging) to the open log file"""
+    try:
+        _DEBUG_LOG_HANDLE.write((msg % args if args else msg) + "\n")
+    except Exception:
+        pass  # Silently ignore debug logging errors
+
+
+# Rebound to _file_debug_log by enable_debug_logging(); callers pass %-style
+# args so nothing is formatted while debugging is off
+debug_log = _noop_debug_log
+
+
+def enable_debug_logging() -> None:
+    """Open the debug log once (line-buffered) and route debug_log() to it."""
+    global DEBUG_MODE, _DEBUG_LOG_HANDLE, debug_log
+    if _DEBUG_LOG_HANDLE is None:
         try:
-            with open(DEBUG_LOG_FILE, "a") as f:
-                f.write(msg + "\n")
-        except Exception:
-            pass  # Silently ignore debug logging errors
+            _DEBUG_LOG_HANDLE = open(DEBUG_LOG_FILE, "a", buffering=1)
+        except OSError:
+            return  # Silently ignore debug logging errors
+    DEBUG_MODE = True
+    debug_log = _file_debug_log
 
-# Import shared GPU utilities
-from gpu_utils import setup_gpu_acceleration
 
-# Set up GPU acceleration before importing argostranslate
-setup_gpu_acceleration(debug_log_func=debug_log)
+def package_index_is_stale() -> bool:
+    """Return True if Argos' local package index is missing or older than PACKAGE_INDEX_MAX_AGE."""
+    try:
+        from argostranslate import settings
+        age = time.time() - os.path.getmtime(settings.local_package_index)
+    except (ImportError, AttributeError, OSError):
+        return True
+    return age > PACKAGE_INDEX_MAX_AGE
+
+
+def update_package_index(argospkg, log) -> None:
+    """Download the remote Argos package index (a network round-trip)."""
+    print(f"[translate] Updating package index...", file=sys.stderr)
+    log("Updating argostranslate package index...")
+    with _INDEX_LOCK:
+        argospkg.update_package_index()
+    log("Package index updated successfully")
+
 
 def auto_download_model(from_code: str, to_code: str, debug_func=None) -> bool:
     """
@@ -55,34 +174,55 @@ def auto_download_model(from_code: str, to_code: str, debug_func=None) -> bool:
 
         log(f"Auto-download requested for {from_code} → {to_code}")
 
-        # Update package index to get latest available models
-        print(f"[translate] Updating package index...", file=sys.stderr)
-        log("Updating argostranslate package index...")
-        argospkg.update_package_index()
-        log("Package index updated successfully")
-
-        # Find the specific translation package
-        available_packages = argospkg.get_available_packages()
-        log(f"Found {len(available_packages)} available packages")
-
-        target_package = None
-        for pkg in available_packages:
-            if pkg.type == "translate" and pkg.from_code == from_code and pkg.to_code == to_code:
-                target_package = pkg
-                break
-
-        if not target_package:
-            print(f"[translate] ERROR: No translation model found for {from_code} → {to_code}", file=sys.stderr)
-            print(f"[translate] Available language pairs can be found at: https://www.argosopentech.com/argospm/index/", file=sys.stderr)
-            log(f"No package found for {from_code} → {to_code}")
-            return False
-
-        # Download and install the package
-        print(f"[translate] Downloading {from_code} → {to_code} translation model...", file=sys.stderr)
-        log(f"Downloading package: {target_package.package_name}")
+        # Update package index to get latest available models, unless the
+        # local copy is recent enough
+        index_refreshed = False
+        if package_index_is_stale():
+            update_package_index(argospkg, log)
+            index_refreshed = True
+        else:
+            log("Package index is recent, skipping update")
+
+        while True:
+            # Find the specific translation package
+            available_packages = argospkg.get_available_packages()
+            log(f"Found {len(available_packages)} available packages")
+
+            target_package = None
+            for pkg in available_packages:
+                if pkg.type == "translate" and pkg.from_code == from_code and pkg.to_code == to_code:
+                    target_package = pkg
+                    break
+
+            if not target_package and not index_refreshed:
+                # Cached index may predate this package; refresh once and retry
+                log(f"No package for {from_code} → {to_code} in cached index, refreshing")
+                update_package_index(argospkg, log)
+                index_refreshed = True
+                continue
+
+            if not target_package:
+                print(f"[translate] ERROR: No translation model found for {from_code} → {to_code}", file=sys.stderr)
+                print(f"[translate] Available language pairs can be found at: https://www.argosopentech.com/argospm/index/", file=sys.stderr)
+                log(f"No package found for {from_code} → {to_code}")
+                return False
 
-        download_path = target_package.download()
-        log(f"Downloaded to: {download_path}")
+            # Download and install the package
+            print(f"[translate] Downloading {from_code} → {to_code} translation model...", file=sys.stderr)
+            log(f"Downloading package: {target_package.package_name}")
+
+            try:
+                download_path = target_package.download()
+            except OSError as e:
+                if index_refreshed:
+                    raise
+                # Cached index may point at a moved/removed file; refresh once and retry
+                log(f"Download failed ({e}), refreshing package index and retrying")
+                update_package_index(argospkg, log)
+                index_refreshed = True
+                continue
+            log(f"Downloaded to: {download_path}")
+            break
 
         print(f"[translate] Installing {from_code} → {to_code} model...", file=sys.stderr)
         argospkg.install_from_path(download_path)
@@ -105,72 +245,366 @@ def auto_download_model(from_code: str, to_code: str, debug_func=None) -> bool:
         return False
 
 
-def translate_html_carefully(translator, html_content: str) -> str:
+def get_language_detector():
     """
-    Translate HTML content while preserving all HTML structure, tags, attributes, and comments.
-    Only translates text nodes, leaving everything else untouched.
+    Return langdetect's detect() function, importing it on first use.
+
+    The import is deferred so the fake and English fast paths never pay for
+    it, and done only once so daemon requests skip the import machinery.
+
+    Returns:
+        The detect callable, or None if langdetect is not installed.
     """
-    try:
-        from bs4 import BeautifulSoup, NavigableString, Comment, Doctype
-        import re
+    global _DETECT
+    if _DETECT is None:
+        try:
+            from langdetect import detect
+            _DETECT = detect
+        except ImportError as e:
+            debug_log("langdetect not available: %s", e)
+            _DETECT = False
+    return _DETECT or None
 
-        # Parse HTML with html.parser (better for email HTML with malformed content)
-        soup = BeautifulSoup(html_content, 'html.parser')
 
-        def should_translate_text(text: str) -> bool:
-            """Check if text is worth translating (not just whitespace or very short)"""
-            cleaned = text.strip()
-            # Don't translate if it's just whitespace, very short, or looks like code
-            if not cleaned or len(cleaned) < 2:
-                return False
-            # Don't translate if it's all numbers/symbols
-            if re.match(r'^[\d\s\W]+$', cleaned):
-                return False
-            return True
+def load_ctranslate2_model(package_translation) -> None:
+    """
+    Create the CTranslate2 translator for an Argos PackageTranslation.
 
-        def translate_element(element):
-            """Recursively translate text nodes in an element"""
-            if isinstance(element, NavigableString):
-                # Skip comments, doctype, and other special strings
-                if isinstance(element, (Comment, Doctype)):
-                    return
+    Argos builds it lazily with only device=...; building it here lets us pass
+    device_index from TRANSLATE_CUDA_DEVICE / ARGOS_DEVICE_TYPE=cuda:N,
+    compute_type from TRANSLATE_COMPUTE_TYPE and inter_threads=DAEMON_WORKERS,
+    so daemon workers translate concurrently on one shared copy of the weights.
+    Argos then reuses it instead of loading its own.
+    """
+    import ctranslate2
+    from argostranslate import settings
+    from gpu_utils import get_cuda_device_index
+
+    kwargs = {"device": settings.device, "inter_threads": DAEMON_WORKERS}
+    if settings.device == "cuda":
+        device_index = get_cuda_device_index(ctranslate2.get_cuda_device_count(), debug_log)
+        if device_index:
+            kwargs["device_index"] = device_index
+
+    compute_type = COMPUTE_TYPE
+    if compute_type == "auto":
+        compute_type = "int8_float16" if settings.device == "cuda" else "int8"
+    if compute_type in ctranslate2.get_supported_compute_types(settings.device):
+        kwargs["compute_type"] = compute_type
+    elif compute_type != "default":
+        debug_log("Compute type %s not supported on %s, using model default", compute_type, settings.device)
+
+    model_path = str(package_translation.pkg.package_path / "model")
+    package_translation.translator = ctranslate2.Translator(model_path, **kwargs)
+    debug_log("Loaded CTranslate2 model %s (%s)", model_path, kwargs)
+
+
+def iter_package_translations(translator):
+    """
+    Yield the Argos PackageTranslations (objects owning a CTranslate2 model) behind a translator.
 
-                # Only translate if the text is substantial
-                if should_translate_text(element.string):
-                    try:
-                        # Preserve leading/trailing whitespace
-                        original = element.string
-                        stripped = original.strip()
-                        leading_ws = original[:len(original) - len(original.lstrip())]
-                        trailing_ws = original[len(original.rstrip()):]
-
-                        # Translate the stripped text
-                        translated = translator.translate(stripped)
-
-                        # Restore whitespace
-                        element.string.replace_with(leading_ws + translated + trailing_ws)
-                    except (RuntimeError, ValueError, AttributeError) as e:
-                        # If translation fails for this node, leave it as-is
-                        print(f"[translate] Failed to translate text node: {e}", file=sys.stderr)
-                        pass
-            elif hasattr(element, 'children'):
-                # Recursively process all children
-                for child in list(element.children):
-                    translate_element(child)
-
-        # Translate all text nodes in the document
-        translate_element(soup)
-
-        # Return the HTML, preserving the original structure as much as possible
-        # Use str() instead of prettify() to avoid reformatting
-        return str(soup)
-
-    except (ImportError, ValueError, RuntimeError) as e:
+    Direct pairs are a CachedTranslation wrapping one PackageTranslation; pivot
+    pairs are a CompositeTranslation chaining two of them via t1/t2.
+    """
+    stack = [translator]
+    while stack:
+        part = stack.pop()
+        part = getattr(part, "underlying", part)
+        if getattr(part, "pkg", None) is not None and hasattr(part, "translator"):
+            yield part
+        stack.extend(t for t in (getattr(part, "t2", None), getattr(part, "t1", None)) if t is not None)
+
+
+def should_translate_text(text: str) -> bool:
+    """Check if text is worth translating (not just whitespace or very short)"""
+    cleaned = text.strip()
+    # Don't translate if it's just whitespace, very short, or looks like code
+    if not cleaned or len(cleaned) < 2:
+        return False
+    # Don't translate if it's all numbers/symbols
+    if cleaned.isascii():
+        return not _SKIP_ASCII_CHARS.issuperset(cleaned)
+    return not _SKIP_RE.match(cleaned)
+
+
+def translate_batch(translator, texts: list) -> list:
+    """
+    Translate a list of strings, batching them into one CTranslate2 call when possible.
+
+    Argos' own translate() runs one model call per string. For installed Argos
+    packages we tokenize each short string as a single sentence and hand the
+    whole list to ctranslate2.Translator.translate_batch(). Long or multi-line
+    strings, and translators without a CTranslate2 backend, go through
+    translator.translate() one by one so sentence splitting still applies.
+
+    Args:
+        translator: Argos translator (or any object with a translate() method)
+        texts: Strings to translate
+
+    Returns:
+        List of translations aligned with texts; None where translation failed.
+    """
+    results = [None] * len(texts)
+    pending = []
+    with _TEXT_CACHE_LOCK:
+        for i, text in enumerate(texts):
+            cached = _TEXT_CACHE.get((translator, text))
+            if cached is not None:
+                _TEXT_CACHE.move_to_end((translator, text))
+                results[i] = cached
+            else:
+                pending.append(i)
+
+    # CachedTranslation wraps the PackageTranslation that owns the model
+    package_translation = getattr(translator, "underlying", translator)
+    pkg = getattr(package_translation, "pkg", None)
+
+    batchable = [i for i in pending if len(texts[i]) <= BATCH_MAX_CHARS and "\n" not in texts[i]]
+
+    if pkg is not None and hasattr(package_translation, "translator") and batchable:
+        try:
+            if package_translation.translator is None:
+                load_ctranslate2_model(package_translation)
+
+            tokenized = [pkg.tokenizer.encode(texts[i]) for i in batchable]
+            target_prefix = [[pkg.target_prefix]] * len(tokenized) if pkg.target_prefix else None
+            translated_batches = package_translation.translator.translate_batch(
+                tokenized,
+                target_prefix=target_prefix,
+                replace_unknowns=True,
+                max_batch_size=BATCH_SIZE,
+                beam_size=4,
+                length_penalty=0.2,
+            )
+
+            for i, translated_batch in zip(batchable, translated_batches):
+                value = pkg.tokenizer.decode(translated_batch.hypotheses[0])
+                if pkg.target_prefix and value.startswith(pkg.target_prefix):
+                    value = value[len(pkg.target_prefix):]
+                # Remove space at the beginning added by the tokenizer
+                results[i] = value[1:] if value.startswith(" ") else value
+
+            pending = [i for i in pending if results[i] is None]
+            debug_log("Batch translated %d text nodes", len(batchable))
+        except (ImportError, AttributeError, RuntimeError, ValueError, OSError) as e:
+            debug_log("Batch translation unavailable (%s), translating nodes individually", e)
+
+    for i in pending:
+        try:
+            results[i] = translator.translate(texts[i])
+        except (RuntimeError, ValueError, AttributeError) as e:
+            # If translation fails for this node, leave it as-is
+            print(f"[translate] Failed to translate text node: {e}", file=sys.stderr)
+
+    with _TEXT_CACHE_LOCK:
+        for i, text in enumerate(texts):
+            if results[i] is not None:
+                _TEXT_CACHE[(translator, text)] = results[i]
+        while len(_TEXT_CACHE) > TEXT_CACHE_SIZE:
+            _TEXT_CACHE.popitem(last=False)
+
+    return results
+
+
+class _TextSpanScanner(HTMLParser):
+    """
+    Record the (start, end, text) source positions of every text run in an HTML document.
+
+    Runs inside SKIP_TEXT_TAGS are ignored. text is the run with character
+    references decoded; start/end index the raw input, so callers can splice
+    replacements into the original markup without rebuilding it.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.spans = []
+        self._skip_depth = 0
+        self._pending_data = None
+        self._fed = 0  # Characters passed to feed() so far
+        self._closing = False  # True while close() flushes unterminated markup
+
+    def feed(self, data):
+        self._fed += len(data)
+        super().feed(data)
+
+    def close(self):
+        # An unparsed tail starting with "<" is a tag or comment left open at
+        # the end of the input; close() would flush it as text ("<p", "!-- x")
+        self._closing = self.rawdata.startswith("<")
+        super().close()
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIP_TEXT_TAGS:
+            self._skip_depth += 1
+
+    def handle_endtag(self, tag):
+        if tag in SKIP_TEXT_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+
+    def handle_data(self, data):
+        if self._closing:
+            return  # Broken trailing markup, not prose
+        if not self._skip_depth:
+            self._pending_data = data
+
+    def updatepos(self, i, j):
+        # HTMLParser reports every consumed chunk rawdata[i:j] here, right
+        # after handle_data() for text, which gives us raw offsets for free.
+        # rawdata only holds the still-unparsed tail once parsing stopped
+        # early (e.g. at a trailing "&"), so rebase i/j onto the whole input.
+        if self._pending_data is not None:
+            data, self._pending_data = self._pending_data, None
+            base = self._fed - len(self.rawdata)
+            start, end = i + base, j + base
+            if self.spans and self.spans[-1][1] == start:
+                # Adjacent runs (e.g. around a stray "<") form one text node
+                start, _, previous = self.spans[-1]
+                self.spans[-1] = (start, end, previous + data)
+            else:
+                self.spans.append((start, end, data))
+        return super().updatepos(i, j)
+
+
+def scan_text_spans(html_content: str) -> list:
+    """Tokenize HTML (no tree is built) and return its text runs as (start, end, text)."""
+    scanner = _TextSpanScanner()
+    scanner.feed(html_content)
+    scanner.close()
+    return scanner.spans
+
+
+def detection_sample(text: str, spans=None) -> str:
+    """
+    Return the start of the input's text, whitespace-collapsed, for language checks.
+
+    Covers both DETECTION_SAMPLE_CHARS (langdetect) and ENGLISH_SAMPLE_CHARS
+    (looks_like_english), so neither ever scans the full body. For HTML, pass
+    the spans from scan_text_spans() to sample the visible text only.
+    """
+    limit = max(DETECTION_SAMPLE_CHARS, ENGLISH_SAMPLE_CHARS)
+    if spans is not None:
+        parts = []
+        size = 0
+        for _, _, data in spans:
+            parts.append(data)
+            size += len(data)
+            if size >= limit * 2:
+                break
+        text = " ".join(parts)
+    # Over-read a little so collapsed whitespace still leaves enough characters
+    return " ".join(text[:limit * 2].split())[:limit]
+
+
+def translate_html_carefully(translator, html_content: str, spans=None) -> str:
+    """
+    Translate HTML content while preserving all HTML structure, tags, attributes, and comments.
+    Only translates text nodes, leaving everything else untouched.
+
+    Translations are spliced into the original string at the text positions
+    found by scan_text_spans(), so all markup outside translated text stays
+    byte-identical. Pass spans if the document was already scanned.
+    """
+    try:
+        if spans is None:
+            spans = scan_text_spans(html_content)
+
+        # Pass 1: collect (start, end, leading_ws, stripped, trailing_ws) for
+        # every translatable text run; whitespace is restored around the translation
+        entries = []
+        for start, end, data in spans:
+            stripped = data.strip()
+            if stripped and should_translate_text(stripped):
+                lead = len(data) - len(data.lstrip())
+                entries.append((start, end, data[:lead], stripped, data[lead + len(stripped):]))
+
+        # Translate all collected texts in as few model calls as possible
+        translated_texts = translate_batch(translator, [entry[3] for entry in entries])
+
+        # Pass 2: rebuild the document from the untouched markup between runs
+        parts = []
+        position = 0
+        for (start, end, leading_ws, stripped, trailing_ws), translated in zip(entries, translated_texts):
+            if translated is None:
+                continue  # Leave this run as-is
+            parts.append(html_content[position:start])
+            parts.append(html_escape(leading_ws + translated + trailing_ws, quote=False))
+            position = end
+        parts.append(html_content[position:])
+        return "".join(parts)
+
+    except (AssertionError, ValueError, RuntimeError) as e:
+        # html.parser signals malformed declarations with AssertionError
         print(f"[translate] HTML parsing failed: {e}, falling back to plain translation", file=sys.stderr)
         # Fall back to plain text translation
         return translator.translate(html_content)
 
 
+def installed_languages_by_code(argostrans, refresh: bool = False) -> dict:
+    """
+    Return installed Argos languages keyed by ISO code.
+
+    get_installed_languages() scans the packages directory on disk, so the
+    result is kept for the life of the process (the daemon serves many
+    requests) and only rebuilt with refresh=True after a model download.
+    """
+    global _LANGUAGES_BY_CODE
+    if _LANGUAGES_BY_CODE is None or refresh:
+        _LANGUAGES_BY_CODE = {l.code: l for l in argostrans.get_installed_languages()}
+        debug_log("Installed languages: %s", list(_LANGUAGES_BY_CODE))
+    return _LANGUAGES_BY_CODE
+
+
+def load_translator(argostrans, from_code: str, target: str, install_on_demand: bool):
+    """
+    Look up (and optionally auto-download) the Argos translator for a language pair.
+
+    Returns:
+        The translator object, or None if the pair is unavailable.
+    """
+    # Try installed languages first
+    languages = installed_languages_by_code(argostrans)
+    src_lang = languages.get(from_code)
+    tgt_lang = languages.get(target)
+
+    debug_log("Source lang: %s", src_lang.code if src_lang else 'None')
+    debug_log("Target lang: %s", tgt_lang.code if tgt_lang else 'None')
+
+    # If models are missing, try to auto-download (if enabled)
+    if not src_lang or not tgt_lang:
+        if install_on_demand:
+            print(f"[translate] Model {from_code} → {target} not installed, attempting auto-download...", file=sys.stderr)
+            debug_log(f"Model {from_code} → {target} not installed, attempting auto-download...")
+            if auto_download_model(from_code, target, debug_func=debug_log):
+                # Reload installed languages after download
+                languages = installed_languages_by_code(argostrans, refresh=True)
+                src_lang = languages.get(from_code)
+                tgt_lang = languages.get(target)
+                debug_log("After download - Source lang: %s", src_lang.code if src_lang else 'None')
+                debug_log("After download - Target lang: %s", tgt_lang.code if tgt_lang else 'None')
+        else:
+            print(f"[translate] ERROR: Model {from_code} → {target} not installed", file=sys.stderr)
+            print(f"[translate] Auto-download is disabled. Please install models manually using setup_models.py", file=sys.stderr)
+            debug_log(f"Model {from_code} → {target} not installed, auto-download disabled")
+            return None
+
+    if not src_lang or not tgt_lang:
+        return None
+
+    try:
+        translator = src_lang.get_translation(tgt_lang)
+
+        # Load models up front (on the requested GPU, sized for concurrent requests)
+        for package_translation in iter_package_translations(translator):
+            if package_translation.translator is None:
+                load_ctranslate2_model(package_translation)
+    except (RuntimeError, ValueError, AttributeError, OSError) as e:
+        debug_log(f"Failed to load translator: {e}")
+        print(f"[translate] ERROR: Failed to load translator: {e}", file=sys.stderr)
+        return None
+    debug_log("Translator found: %s", translator)
+    return translator
+
+
 def translate_offline(text: str, target: str, is_html: bool, install_on_demand: bool = True) -> str:
     """
     Translate text using ArgosTranslate offline translation.
@@ -184,10 +618,11 @@ def translate_offline(text: str, target: str, is_html: bool, install_on_demand:
     Returns:
         Translated text, or original text if translation fails
     """
-    debug_log(f"=== TRANSLATE REQUEST ===")
-    debug_log(f"Input length: {len(text)}")
-    debug_log(f"Input preview: {text[:200] if len(text) > 200 else text}")
-    debug_log(f"Target: {target}, HTML: {is_html}, Install-on-demand: {install_on_demand}")
+    if debug_log is not _noop_debug_log:
+        debug_log("=== TRANSLATE REQUEST ===")
+        debug_log("Input length: %d", len(text))
+        debug_log("Input preview: %s", text[:200])
+        debug_log("Target: %s, HTML: %s, Install-on-demand: %s", target, is_html, install_on_demand)
 
     fake_mode = os.environ.get("TRANSLATE_FAKE_UPPERCASE") == "1"
 
@@ -200,33 +635,33 @@ def translate_offline(text: str, target: str, is_html: bool, install_on_demand:
             return translate_html_carefully(translator, text)
         return translator.translate(text)
 
-    try:
-        import argostranslate.package as argospkg
-        import argostranslate.translate as argostrans
-        debug_log("Argos modules imported successfully")
-    except ImportError as e:
-        debug_log(f"Failed to import argos: {e}")
-        print(f"[translate] ERROR: ArgosTranslate not available: {e}", file=sys.stderr)
+    # Scan HTML once; the text runs serve both language detection and translation
+    spans = None
+    if is_html:
+        try:
+            spans = scan_text_spans(text)
+        except (AssertionError, ValueError):
+            pass  # translate_html_carefully reports the failure
+
+    # For HTML, use the extracted text content for better detection
+    text_for_detection = detection_sample(text, spans)
+
+    # Fast exit for text that is obviously English already: skips langdetect
+    # and never imports argostranslate
+    if target == "en" and looks_like_english(text_for_detection):
+        debug_log("Input looks like English already, no translation needed")
         return text
 
     # Language detection (optional)
     detected = None
-    if not fake_mode:
+    detect = get_language_detector()
+    if detect is not None:
         try:
-            from langdetect import detect
-            # For HTML, try to extract text content for better detection
-            text_for_detection = text
-            if is_html:
-                try:
-                    from bs4 import BeautifulSoup
-                    soup = BeautifulSoup(text, 'html.parser')
-                    text_for_detection = soup.get_text()
-                except (ImportError, ValueError):
-                    pass  # Fall back to full HTML
-            detected = detect(text_for_detection)
-            debug_log(f"Detected language: {detected}")
-        except (ImportError, ValueError, RuntimeError) as e:
-            debug_log(f"Language detection failed: {e}")
+            # A couple of thousand characters are plenty for langdetect
+            detected = detect(text_for_detection[:DETECTION_SAMPLE_CHARS])
+            debug_log("Detected language: %s", detected)
+        except (ValueError, RuntimeError) as e:
+            debug_log("Language detection failed: %s", e)
 
     from_code = detected or "auto"
 
@@ -236,67 +671,271 @@ def translate_offline(text: str, target: str, is_html: bool, install_on_demand:
 
     # If no language detected, return original text
     if from_code == "auto" or from_code == target:
-        debug_log(f"No translation needed (from={from_code}, target={target})")
+        debug_log("No translation needed (from=%s, target=%s)", from_code, target)
         return text
 
-    # Try installed languages first
-    installed = argostrans.get_installed_languages()
-    debug_log(f"Installed languages: {[l.code for l in installed]}")
+    # Set up GPU acceleration before importing argostranslate. Done here rather
+    # than at import time so the fake and no-translation paths never pay for the probe.
+    from gpu_utils import setup_gpu_acceleration
+    setup_gpu_acceleration(debug_log_func=debug_log)
 
-    src_lang = next((l for l in installed if l.code == from_code), None)
-    tgt_lang = next((l for l in installed if l.code == target), None)
+    try:
+        import argostranslate.package as argospkg
+        import argostranslate.translate as argostrans
+        debug_log("Argos modules imported successfully")
+    except ImportError as e:
+        debug_log(f"Failed to import argos: {e}")
+        print(f"[translate] ERROR: ArgosTranslate not available: {e}", file=sys.stderr)
+        return text
 
-    debug_log(f"Source lang: {src_lang.code if src_lang else 'None'}")
-    debug_log(f"Target lang: {tgt_lang.code if tgt_lang else 'None'}")
+    pair = (from_code, target)
+    translator = _TRANSLATORS.get(pair)
+    if translator is None:
+        with _LOAD_LOCKS_LOCK:
+            pair_lock = _LOAD_LOCKS.setdefault(pair, threading.Lock())
+        with pair_lock:
+            translator = _TRANSLATORS.get(pair)  # Loaded by another request meanwhile?
+            if translator is None:
+                translator = load_translator(argostrans, from_code, target, install_on_demand)
+                if translator is not None:
+                    _TRANSLATORS[pair] = translator
+    else:
+        debug_log("Reusing cached translator for %s → %s", from_code, target)
+    if translator is None:
+        # Best-effort: no-op if translator cannot be found
+        debug_log("No translator found, returning original")
+        return text
+
+    try:
+        # Use our custom HTML translation for HTML content
+        if is_html:
+            result = translate_html_carefully(translator, text, spans)
+            debug_log("HTML translation result length: %d", len(result))
+            debug_log("Translation preview: %s", result[:200])
+            return result
+
+        # Plain text translation
+        result = translator.translate(text)
+        debug_log("Translation result length: %d", len(result))
+        debug_log("Translation preview: %s", result[:200])
+        return result
+    except (RuntimeError, ValueError, AttributeError, OSError) as e:
+        debug_log("Translation failed: %s", e)
+        print(f"[translate] ERROR: Translation failed: {e}", file=sys.stderr)
+        return text
 
-    # If models are missing, try to auto-download (if enabled)
-    if not src_lang or not tgt_lang:
-        if install_on_demand:
-            print(f"[translate] Model {from_code} → {target} not installed, attempting auto-download...", file=sys.stderr)
-            debug_log(f"Model {from_code} → {target} not installed, attempting auto-download...")
-            if auto_download_model(from_code, target, debug_func=debug_log):
-                # Reload installed languages after download
-                installed = argostrans.get_installed_languages()
-                src_lang = next((l for l in installed if l.code == from_code), None)
-                tgt_lang = next((l for l in installed if l.code == target), None)
-                debug_log(f"After download - Source lang: {src_lang.code if src_lang else 'None'}")
-                debug_log(f"After download - Target lang: {tgt_lang.code if tgt_lang else 'None'}")
-        else:
-            print(f"[translate] ERROR: Model {from_code} → {target} not installed", file=sys.stderr)
-            print(f"[translate] Auto-download is disabled. Please install models manually using setup_models.py", file=sys.stderr)
-            debug_log(f"Model {from_code} → {target} not installed, auto-download disabled")
-            return text
 
-    if src_lang and tgt_lang:
+def read_stdin() -> str:
+    """
+    Read all of stdin as UTF-8 text.
+
+    Reads raw 64 KiB chunks into one bytearray and decodes once at the end,
+    bypassing the text-mode stdin wrapper and its intermediate buffers.
+    """
+    buf = bytearray()
+    fd = sys.stdin.fileno()
+    while True:
+        chunk = os.read(fd, STDIN_CHUNK_SIZE)
+        if not chunk:
+            break
+        buf += chunk
+    return buf.decode("utf-8", errors="replace")
+
+
+def daemon_config() -> dict:
+    """
+    Describe the code and environment translate requests are served under.
+
+    Clients send their own daemon_config() with every request. A daemon
+    started from another environment, or from files an upgrade has since
+    replaced, must not answer them with its stale settings.
+    """
+    here = os.path.dirname(os.path.abspath(__file__))
+    version = []
+    for name in DAEMON_MODULES:
         try:
-            translator = src_lang.get_translation(tgt_lang)
-            debug_log(f"Translator found: {translator}")
-
-            # Use our custom HTML translation for HTML content
-            if is_html:
-                result = translate_html_carefully(translator, text)
-                debug_log(f"HTML translation result length: {len(result)}")
-                debug_log(f"Translation preview: {result[:200] if len(result) > 200 else result}")
-                return result
-
-            # Plain text translation
-            result = translator.translate(text)
-            debug_log(f"Translation result length: {len(result)}")
-            debug_log(f"Translation preview: {result[:200] if len(result) > 200 else result}")
-            return result
-        except (RuntimeError, ValueError, AttributeError, OSError) as e:
-            debug_log(f"Translation failed: {e}")
-            print(f"[translate] ERROR: Translation failed: {e}", file=sys.stderr)
-            return text
+            version.append(os.stat(os.path.join(here, name)).st_mtime_ns)
+        except OSError:
+            version.append(None)
+    return {"env": {key: os.environ.get(key) for key in DAEMON_ENV_KEYS}, "version": version}
+
+
+def ensure_socket_dir(socket_path: str) -> bool:
+    """
+    Create SOCKET_FALLBACK_DIR if socket_path is in it, and check it is private.
+
+    The directory must be a real directory owned by this user that no one else
+    can access; a path of another user's making is refused. Other directories
+    ($XDG_RUNTIME_DIR, --socket) are used as given.
+
+    Returns:
+        True if the daemon may bind socket_path.
+    """
+    directory = os.path.dirname(socket_path)
+    if directory != SOCKET_FALLBACK_DIR:
+        return True
+    try:
+        os.mkdir(directory, 0o700)
+    except FileExistsError:
+        pass
+    except OSError as e:
+        print(f"[translate] ERROR: Cannot create {directory}: {e}", file=sys.stderr)
+        return False
+    st = os.lstat(directory)
+    if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid() or st.st_mode & 0o077:
+        print(f"[translate] ERROR: {directory} is not a private directory of this user, "
+              "not starting daemon", file=sys.stderr)
+        return False
+    return True
+
+
+def serve_daemon(socket_path: str) -> int:
+    """
+    Serve translation requests on a Unix socket until terminated or idle.
+
+    Each request is one JSON line {"text", "target", "is_html", "install_on_demand",
+    "config"} and is answered with one JSON line {"translated"}. Each connection
+    gets a thread; up to DAEMON_WORKERS requests translate at once on the same
+    loaded models, so extra concurrency costs no extra model memory.
+
+    A request whose "config" differs from this daemon's daemon_config() is
+    answered with {"stale": true} and the daemon exits, so the client can start
+    a replacement. The daemon also exits after DAEMON_IDLE_TIMEOUT seconds
+    without requests (0 disables this).
+
+    Args:
+        socket_path: Filesystem path of the Unix socket to bind
+
+    Returns:
+        Process exit code
+    """
+    import signal
+    import socket
+    import socketserver
+
+    if not ensure_socket_dir(socket_path):
+        return 1
+
+    # Refuse to start if another daemon is already serving this socket
+    if os.path.exists(socket_path):
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(socket_path)
+            print(f"[translate] Daemon already running on {socket_path}", file=sys.stderr)
+            return 0
+        except OSError:
+            try:
+                os.unlink(socket_path)  # Stale socket from a previous daemon
+            except OSError as e:
+                print(f"[translate] ERROR: Cannot remove stale socket {socket_path}: {e}", file=sys.stderr)
+                return 1
+        finally:
+            probe.close()
+
+    # Taken before any model load: GPU setup rewrites ARGOS_DEVICE_TYPE
+    config = daemon_config()
+    workers = threading.BoundedSemaphore(DAEMON_WORKERS)
+    # Requests in progress and when the last one ended, for the idle timeout
+    activity = {"active": 0, "last": time.monotonic()}
+    activity_lock = threading.Lock()
+    activity_changed = threading.Condition(activity_lock)
+
+    def retire():
+        """Give up the socket path right away and stop serving."""
+        if server.socket_inode is not None:
+            server.socket_inode = None
+            try:
+                os.unlink(socket_path)
+            except OSError:
+                pass
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    class _RequestHandler(socketserver.StreamRequestHandler):
+        def handle(self):
+            for line in self.rfile:
+                if not line.strip():
+                    continue
+                with activity_lock:
+                    activity["active"] += 1
+                try:
+                    # Counted as active until the reply is sent (see the exit path below)
+                    self.wfile.write(dumps_json(self.answer(line)) + b"\n")
+                    self.wfile.flush()
+                finally:
+                    with activity_lock:
+                        activity["active"] -= 1
+                        activity["last"] = time.monotonic()
+                        activity_changed.notify_all()
+
+        def answer(self, line: bytes) -> dict:
+            text = ""
+            try:
+                request = json.loads(line)
+                if request.get("config") != config:
+                    debug_log("Client environment or version differs, daemon exiting")
+                    with activity_lock:
+                        retire()
+                    return {"stale": True}
+                text = request.get("text", "")
+                with workers:
+                    out = translate_offline(text, request.get("target", "en"),
+                                            bool(request.get("is_html", False)),
+                                            bool(request.get("install_on_demand", True)))
+            except Exception as e:
+                debug_log("Exception in daemon request: %s", e)
+                print(f"[translate] ERROR: Unexpected exception: {e}", file=sys.stderr)
+                out = text
+            return {"translated": out}
+
+    class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+        socket_inode = None  # Unlink the path only while it is still our socket
+
+    old_umask = os.umask(0o077)  # Socket is private to the current user
+    try:
+        server = _Server(socket_path, _RequestHandler)
+    finally:
+        os.umask(old_umask)
+    server.socket_inode = os.stat(socket_path).st_ino
+
+    def exit_when_idle():
+        while True:
+            time.sleep(min(DAEMON_IDLE_TIMEOUT, 30))
+            with activity_lock:
+                if not activity["active"] and time.monotonic() - activity["last"] >= DAEMON_IDLE_TIMEOUT:
+                    debug_log("Daemon idle for %d s, exiting", DAEMON_IDLE_TIMEOUT)
+                    retire()
+                    return
+
+    if DAEMON_IDLE_TIMEOUT:
+        threading.Thread(target=exit_when_idle, daemon=True).start()
+
+    # Exit through the cleanup path below on SIGTERM (e.g. session logout)
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+    print(f"[translate] Daemon listening on {socket_path}", file=sys.stderr)
+    debug_log(f"Daemon listening on {socket_path}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        try:
+            # A replacement daemon may already own the path
+            if server.socket_inode is not None and os.stat(socket_path).st_ino == server.socket_inode:
+                os.unlink(socket_path)
+        except OSError:
+            pass
+        # Handler threads are daemon threads: let requests already being
+        # translated finish instead of cutting their clients off
+        with activity_lock:
+            activity_changed.wait_for(lambda: not activity["active"])
+    return 0
 
-    # Best-effort: no-op if translator cannot be found
-    debug_log("No translator found, returning original")
-    return text
 
 def main() -> int:
     """Main entry point for the translation runner."""
-    global DEBUG_MODE
-
     ap = argparse.ArgumentParser(description="Offline translation using ArgosTranslate")
     ap.add_argument("--target", default="en", help="Target language (ISO 639-1 code, default: en)")
     ap.add_argument("--html", dest="is_html", action="store_true", help="Input is HTML")
@@ -306,15 +945,22 @@ def main() -> int:
     ap.add_argument("--no-install-on-demand", dest="install_on_demand", action="store_false",
                     help="Disable automatic download of missing models")
     ap.add_argument("--debug", action="store_true", help=f"Enable debug logging to {DEBUG_LOG_FILE}")
+    ap.add_argument("--daemon", action="store_true",
+                    help="Keep models loaded and serve requests on a Unix socket")
+    ap.add_argument("--socket", default=DEFAULT_SOCKET_PATH,
+                    help=f"Socket path for --daemon (default: {DEFAULT_SOCKET_PATH})")
     args = ap.parse_args()
 
     # Enable debug mode if requested
     if args.debug:
-        DEBUG_MODE = True
+        enable_debug_logging()
         debug_log("\n\n=== NEW TRANSLATION REQUEST (DEBUG MODE) ===")
         debug_log(f"Args: target={args.target}, html={args.is_html}, install_on_demand={args.install_on_demand}")
 
-    data = sys.stdin.read()
+    if args.daemon:
+        return serve_daemon(args.socket)
+
+    data = read_stdin()
     if args.debug:
         debug_log(f"Read {len(data)} bytes from stdin")
 
@@ -330,7 +976,7 @@ def main() -> int:
 
     # Output JSON response with translated content
     response = {"translated": out}
-    sys.stdout.write(json.dumps(response))
+    sys.stdout.buffer.write(dumps_json(response))
     sys.stdout.flush()
 
     if args.debug:
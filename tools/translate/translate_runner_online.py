@@ -9,6 +9,8 @@ Options:
   --provider <name>   translation provider (google, mymemory, libre, etc.)
   --html | --text     hint whether input is HTML (default: text)
   --debug             enable debug logging to /tmp/translate_online_debug.log
+  --fallback-providers <a,b>  providers used while --provider is rate-limited
+                      (default: $TRANSLATE_FALLBACK_PROVIDERS, none)
 
 Supported providers:
   - google: Google Translate (free, no API key)
@@ -19,29 +21,235 @@ Supported providers:
 """
 
 import argparse
+import copy
+import hashlib
 import os
 import sys
 import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from html import unescape as html_unescape
 from typing import Optional
 
-# Debug logging support
+from json_utils import write_json
+from lang_utils import DETECTION_SAMPLE_CHARS, looks_like_english
+
+# Third-party dependencies are imported once here; a missing one is reported by
+# translate_online() instead of failing on import
+try:
+    from bs4 import BeautifulSoup, NavigableString
+    from bs4.element import PreformattedString
+    HAS_BS4 = True
+except ImportError:
+    HAS_BS4 = False
+
+try:
+    from langdetect import DetectorFactory, detect as _langdetect
+    # langdetect is probabilistic; a fixed seed makes repeated detections of the
+    # same text agree (and so safe to cache)
+    DetectorFactory.seed = 0
+except ImportError:
+    _langdetect = None
+
+# cld3 (optional, pip install pycld3) is Chrome's C++ language identifier:
+# orders of magnitude faster than langdetect and better on short text.
+# langdetect remains the fallback for when it is missing or unsure.
+try:
+    import cld3
+except ImportError:
+    cld3 = None
+# cld3 codes that differ from the ISO 639-1 codes langdetect returns
+_CLD3_CODES = {"iw": "he", "jw": "jv"}
+
+try:
+    from deep_translator import GoogleTranslator, MyMemoryTranslator, LibreTranslator
+    from deep_translator.exceptions import (
+        NotValidPayload,
+        TranslationNotFound,
+        RequestError,
+        TooManyRequests,
+    )
+    DEEP_TRANSLATOR_IMPORT_ERROR = None
+except ImportError as e:
+    DEEP_TRANSLATOR_IMPORT_ERROR = e
+
+# Debug logging support: records are dropped cheaply until enable_debug_logging()
 DEBUG_MODE = False
 DEBUG_LOG_FILE = "/tmp/translate_online_debug.log"
-
-def debug_log(msg):
-    """Log debug message if debug mode is enabled"""
+_LOGGER = logging.getLogger("translate_online")
+_LOGGER.propagate = False
+_LOGGER.addHandler(logging.NullHandler())
+
+_WHITESPACE_RE = re.compile(r"\s+")
+# Detection text is pulled out of HTML with regexes rather than a parse:
+# drop non-prose elements (also when cut off at the end of the window), then tags
+_HTML_NON_TEXT_RE = re.compile(r"<(script|style|head)\b.*?(?:</\1\s*>|\Z)|<!--.*?(?:-->|\Z)",
+                               re.IGNORECASE | re.DOTALL)
+_HTML_TAG_RE = re.compile(r"<[^>]*>?")
+
+# Maximum number of strings handed to the provider in one request
+BATCH_SIZE = 50
+
+# Strings are packed into one request joined by this separator, then split
+# back apart; the split pattern tolerates spacing/case drift from the provider
+BULK_SEPARATOR = "\n\n@@@SEP@@@\n\n"
+_BULK_SPLIT_RE = re.compile(r"\s*@\s*@\s*@\s*sep\s*@\s*@\s*@\s*", re.IGNORECASE)
+
+# Characters per packed request, by translator class (providers reject longer input)
+BULK_CHAR_LIMITS = {
+    "MyMemoryTranslator": 500,
+    "GoogleTranslator": 5000,
+    "LibreTranslator": 5000,
+}
+DEFAULT_BULK_CHAR_LIMIT = 5000
+
+# Long plain text is cut at sentence / line ends into pieces this much
+# shorter than the provider limit
+CHUNK_MARGIN = 32
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?])\s+|\n\s*")
+
+# Requests in flight at once, by translator class. Translation is network-bound,
+# so overlapping requests hides round-trip latency; MyMemory rate-limits hard.
+PROVIDER_WORKERS = {
+    "MyMemoryTranslator": 1,
+}
+try:
+    DEFAULT_WORKERS = max(1, int(os.environ.get("TRANSLATE_ONLINE_WORKERS", "4")))
+except ValueError:
+    DEFAULT_WORKERS = 4
+_THREAD_STATE = threading.local()
+
+# Requests per second allowed by translator class (Google throttles above ~5/s)
+PROVIDER_RATES = {
+    "GoogleTranslator": 5,
+    "MyMemoryTranslator": 2,
+}
+DEFAULT_RATE = 5
+_RATE_LIMITERS = {}
+_RATE_LIMITERS_LOCK = threading.Lock()
+
+# Optional providers tried, in order, while the requested one is rate-limited
+# (e.g. "libre,mymemory"). Off by default: email text only goes to the
+# provider the user picked unless more are listed here.
+FALLBACK_PROVIDERS_ENV = "TRANSLATE_FALLBACK_PROVIDERS"
+# Seconds a rate-limited provider is skipped; persisted so later runs skip it too
+PROVIDER_COOLDOWN = 60
+PROVIDER_BACKOFF_FILE = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"),
+                                     "evolution-translate", "provider_backoff.json")
+_EXHAUSTED_UNTIL = None  # provider class name -> time.time() it may be used again
+_EXHAUSTED_LOCK = threading.Lock()
+
+# Retries of a single provider request on rate limiting / network errors
+MAX_RETRIES = 3
+RETRY_DELAY = 1  # seconds, doubled after every attempt
+
+# Kept-alive HTTP connections shared by all provider requests (see use_shared_session)
+HTTP_POOL_SIZE = 10
+_SESSION = None
+
+# Translated strings are cached on disk, keyed by the SHA1 of
+# provider|source|target|text, so quoted replies and boilerplate footers are
+# not sent again. TRANSLATE_DISK_CACHE=0 turns the cache off.
+DISK_CACHE_FILE = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"),
+                               "evolution-translate", "cache.db")
+DISK_CACHE_MAX_ROWS = 100000
+_DISK_CACHE = None  # sqlite3 connection, opened on first use (False if unavailable)
+
+# Stripped text nodes not worth translating: at most one character, numbers
+# only, or containing a URL / email address
+_SKIP_TEXT_RE = re.compile(r'.?|[\d.,\s]+|.*(?:https?://|mailto:|@).*', re.IGNORECASE | re.DOTALL)
+# Elements whose text content is code, not prose
+SKIP_TEXT_TAGS = frozenset({"script", "style"})
+
+# BeautifulSoup tree builder: lxml's C parser when installed, else the stdlib one
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+# Hot paths pass %-style arguments so nothing is formatted while logging is off
+debug_log = _LOGGER.debug
+
+
+def enable_debug_logging() -> None:
+    """Append debug messages to DEBUG_LOG_FILE (the file is opened once)."""
+    global DEBUG_MODE
     if DEBUG_MODE:
-        try:
-            with open(DEBUG_LOG_FILE, "a") as f:
-                f.write(msg + "\n")
-        except Exception:
-            pass
+        return
+    DEBUG_MODE = True
+    try:
+        handler = logging.FileHandler(DEBUG_LOG_FILE)
+    except OSError:
+        return
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    _LOGGER.addHandler(handler)
+    _LOGGER.setLevel(logging.DEBUG)
+
+
+def _detect_sample(sample: str) -> str:
+    """Detect the language of a detection sample with cld3, else langdetect."""
+    if cld3 is not None:
+        prediction = cld3.get_language(sample)
+        # Romanized scripts ("ja-Latn") have no matching provider language code
+        if prediction is not None and prediction.is_reliable and "-" not in prediction.language:
+            return _CLD3_CODES.get(prediction.language, prediction.language)
+        debug_log(f"cld3 unsure ({prediction}), falling back to langdetect")
+
+    if _langdetect is None:
+        debug_log("langdetect not available")
+        return "auto"
+    try:
+        return _langdetect(sample)
+    except Exception as e:
+        debug_log(f"Language detection failed: {e}")
+        return "auto"
+
+
+def _html_text_sample(html_content: str, chars: int) -> str:
+    """
+    Return roughly the first chars characters of text content of an HTML document.
+
+    Looks at a prefix of the markup, growing it until it yields enough text
+    (long <head>/<style> blocks can push the body far in).
+    """
+    window = chars * 4
+    while True:
+        text = _HTML_TAG_RE.sub(" ", _HTML_NON_TEXT_RE.sub(" ", html_content[:window]))
+        text = _WHITESPACE_RE.sub(" ", html_unescape(text)).strip()
+        if len(text) >= chars or window >= len(html_content):
+            return text[:chars]
+        window *= 4
+
+
+def detection_sample(text: str, is_html: bool = False) -> str:
+    """
+    Return the leading text of a message, whitespace-collapsed, for language checks.
+
+    Args:
+        text: Message text or HTML
+        is_html: Whether text is HTML
+
+    Returns:
+        Up to DETECTION_SAMPLE_CHARS * 4 characters of text content
+    """
+    chars = DETECTION_SAMPLE_CHARS * 4
+    if is_html:
+        return _html_text_sample(text, chars)
+    return _WHITESPACE_RE.sub(" ", text[:chars]).strip()
 
 
 def detect_language(text: str, is_html: bool = False) -> str:
     """
     Detect the source language of the text.
 
+    Only the first DETECTION_SAMPLE_CHARS characters of whitespace-collapsed
+    text are examined, and text without any letters is not examined at all.
+
     Args:
         text: Text to detect language from
         is_html: Whether text is HTML
@@ -49,22 +257,480 @@ def detect_language(text: str, is_html: bool = False) -> str:
     Returns:
         ISO 639-1 language code or "auto"
     """
+    sample = detection_sample(text, is_html)[:DETECTION_SAMPLE_CHARS]
+    if not any(c.isalpha() for c in sample):
+        debug_log("No letters to detect language from")
+        return "auto"
+
+    lang_code = _detect_sample(sample)
+    debug_log(f"Detected language: {lang_code}")
+    return lang_code
+
+
+def _load_exhausted() -> dict:
+    """Read the persisted provider cooldowns (best-effort)."""
+    global _EXHAUSTED_UNTIL
+    if _EXHAUSTED_UNTIL is None:
+        try:
+            with open(PROVIDER_BACKOFF_FILE) as f:
+                _EXHAUSTED_UNTIL = {k: float(v) for k, v in json.load(f).items()}
+        except (OSError, ValueError, AttributeError):
+            _EXHAUSTED_UNTIL = {}
+    return _EXHAUSTED_UNTIL
+
+
+def _mark_exhausted(provider: str) -> None:
+    """Skip provider for PROVIDER_COOLDOWN seconds, in this and later runs."""
+    with _EXHAUSTED_LOCK:
+        exhausted = _load_exhausted()
+        now = time.time()
+        exhausted[provider] = now + PROVIDER_COOLDOWN
+        for name in [name for name, until in exhausted.items() if until <= now]:
+            del exhausted[name]
+        try:
+            os.makedirs(os.path.dirname(PROVIDER_BACKOFF_FILE), exist_ok=True)
+            with open(PROVIDER_BACKOFF_FILE, "w") as f:
+                json.dump(exhausted, f)
+        except OSError:
+            pass
+    debug_log(f"{provider} is rate-limited, skipping it for {PROVIDER_COOLDOWN}s")
+
+
+class _ProviderChain:
+    """
+    Translator that sends each request to the first provider not cooling down.
+
+    A provider that stays rate-limited after its retries is skipped for
+    PROVIDER_COOLDOWN seconds and the request moves on to the next one.
+    """
+
+    def __init__(self, translators: list):
+        self.translators = translators
+        self.source = getattr(translators[0], "source", "")
+        self.target = getattr(translators[0], "target", "")
+
+    def translate(self, text: str) -> str:
+        last_error = None
+        for translator in self.translators:
+            name = type(translator).__name__
+            with _EXHAUSTED_LOCK:
+                if _load_exhausted().get(name, 0) > time.time():
+                    continue
+            try:
+                return _call_provider(translator, text)
+            except TooManyRequests as e:
+                _mark_exhausted(name)
+                last_error = e
+        raise last_error or TooManyRequests()
+
+
+def _provider_name(translator) -> str:
+    """Name identifying translator's provider(s) in caches and per-provider settings."""
+    if isinstance(translator, _ProviderChain):
+        return "+".join(type(t).__name__ for t in translator.translators)
+    return type(translator).__name__
+
+
+def _provider_setting(translator, settings: dict, default):
+    """Look up a per-provider setting; a chain gets the strictest (lowest) of its providers."""
+    if isinstance(translator, _ProviderChain):
+        return min(settings.get(type(t).__name__, default) for t in translator.translators)
+    return settings.get(type(translator).__name__, default)
+
+
+class _RateLimiter:
+    """Token bucket allowing `rate` calls per `per` seconds, shared by all worker threads."""
+
+    def __init__(self, rate: float, per: float = 1.0):
+        self.rate = rate
+        self.per = per
+        self.tokens = rate
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a call is allowed."""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate / self.per)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) * self.per / self.rate
+            time.sleep(wait)
+
+
+def _rate_limiter(translator) -> _RateLimiter:
+    """Return the rate limiter for translator's provider."""
+    provider = type(translator).__name__
+    with _RATE_LIMITERS_LOCK:
+        limiter = _RATE_LIMITERS.get(provider)
+        if limiter is None:
+            limiter = _RATE_LIMITERS[provider] = _RateLimiter(PROVIDER_RATES.get(provider, DEFAULT_RATE))
+    return limiter
+
+
+def _call_provider(translator, text: str) -> str:
+    """
+    Send one translate() request, within the provider's rate limit.
+
+    Rate limiting and network errors are retried with exponential backoff, so
+    a throttled request is repeated on its own rather than restarting the page.
+
+    Raises:
+        The provider's exception once MAX_RETRIES attempts have failed.
+    """
+    if isinstance(translator, _ProviderChain):
+        return translator.translate(text)  # Each provider is called through _call_provider
+
+    limiter = _rate_limiter(translator)
+    for attempt in range(MAX_RETRIES):
+        limiter.acquire()
+        try:
+            return translator.translate(text)
+        except (TooManyRequests, RequestError) as e:
+            if attempt == MAX_RETRIES - 1:
+                raise
+            wait_time = RETRY_DELAY * (2 ** attempt)  # Exponential backoff
+            debug_log(f"{type(e).__name__} (attempt {attempt + 1}/{MAX_RETRIES}), retrying in {wait_time}s")
+            time.sleep(wait_time)
+
+
+def _bulk_translate(translator, texts: list):
+    """
+    Translate several strings with a single translate() call.
+
+    The strings are joined with BULK_SEPARATOR, translated as one blob and
+    split back apart.
+
+    Args:
+        translator: deep-translator translator instance
+        texts: Strings to translate (must not contain the separator)
+
+    Returns:
+        List of translations aligned with texts, or None if the provider did
+        not keep the separators intact (the caller then translates per string).
+    """
+    translated = _call_provider(translator, BULK_SEPARATOR.join(texts))
+    if not translated:
+        return None
+    parts = [part.strip() for part in _BULK_SPLIT_RE.split(translated.strip())]
+    if len(parts) != len(texts):
+        debug_log(f"Bulk translation returned {len(parts)} parts for {len(texts)} texts")
+        return None
+    return parts
+
+
+def _bulk_groups(texts: list, char_limit: int):
+    """Yield lists of indices into texts whose joined length stays within char_limit."""
+    group = []
+    size = 0
+    for i, text in enumerate(texts):
+        cost = len(text) + len(BULK_SEPARATOR)
+        if group and (size + cost > char_limit or len(group) >= BATCH_SIZE):
+            yield group
+            group = []
+            size = 0
+        group.append(i)
+        size += cost
+    if group:
+        yield group
+
+
+class _SessionRequests:
+    """Stand-in for the requests module that sends get/post through one shared Session."""
+
+    def __init__(self, session, module):
+        self._session = session
+        self._module = module
+
+    def get(self, *args, **kwargs):
+        return self._session.get(*args, **kwargs)
+
+    def post(self, *args, **kwargs):
+        return self._session.post(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._module, name)
+
+
+def use_shared_session() -> None:
+    """
+    Route deep-translator's HTTP requests through one pooled requests.Session.
+
+    deep-translator calls requests.get/post directly, paying a new TCP + TLS
+    handshake on every translate(); with a shared Session the connection to
+    the provider is kept alive and reused.
+    """
+    global _SESSION
+    if _SESSION is not None:
+        return
+
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    _SESSION = requests.Session()
+    adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE)
+    _SESSION.mount("https://", adapter)
+    _SESSION.mount("http://", adapter)
+
+    shim = _SessionRequests(_SESSION, requests)
+    for name, module in list(sys.modules.items()):
+        if name.startswith("deep_translator.") and getattr(module, "requests", None) is requests:
+            module.requests = shim
+    debug_log("Using a shared HTTP session for provider requests")
+
+
+def _thread_translator(translator):
+    """
+    Return this worker thread's copy of translator.
+
+    deep-translator stores per-request state (e.g. the query parameters) on the
+    translator instance, so concurrent requests must not share one instance.
+    """
+    clones = getattr(_THREAD_STATE, "translators", None)
+    if clones is None:
+        clones = _THREAD_STATE.translators = {}
+    original, clone = clones.get(id(translator), (None, None))
+    if original is not translator:
+        clone = copy.deepcopy(translator)
+        clones[id(translator)] = (translator, clone)
+    return clone
+
+
+def _translate_one(translator, text: str):
+    """Translate a single string, returning None if the provider rejects it."""
     try:
-        from langdetect import detect
-        from bs4 import BeautifulSoup
+        return _call_provider(_thread_translator(translator), text)
+    except (TooManyRequests, RequestError):
+        raise  # Still throttled/unreachable after retries: other strings would fail too
+    except Exception as e:
+        debug_log("Translation error for '%s': %s", text[:50], e)
+        return None
 
-        # Extract text from HTML if needed
-        if is_html:
-            soup = BeautifulSoup(text, 'html.parser')
-            text = soup.get_text()
 
-        # Detect language
-        lang_code = detect(text)
-        debug_log(f"Detected language: {lang_code}")
-        return lang_code
+def _translate_group(translator, batch: list):
+    """Translate one packed group, returning None if it has to be translated per string."""
+    if len(batch) < 2 or any(_BULK_SPLIT_RE.search(text) for text in batch):
+        return None
+    try:
+        batch_result = _bulk_translate(_thread_translator(translator), batch)
+        if batch_result is not None:
+            debug_log(f"Bulk translated {len(batch)} texts in one request")
+        return batch_result
+    except (TooManyRequests, RequestError):
+        raise  # Sending the strings one by one would only multiply the failing requests
     except Exception as e:
-        debug_log(f"Language detection failed: {e}")
-        return "auto"
+        debug_log(f"Bulk translation failed: {e}, falling back to individual")
+        return None
+
+
+def _translate_uncached(translator, texts: list, translated_texts: list) -> None:
+    """
+    Translate a list of strings with as few provider requests as possible.
+
+    Strings are packed into requests of up to BATCH_SIZE strings within the
+    provider's character limit (see _bulk_translate). Groups that cannot be
+    packed, or whose separators do not survive translation, are translated
+    one string per request. Requests run concurrently, up to the provider's
+    PROVIDER_WORKERS (TRANSLATE_ONLINE_WORKERS by default).
+
+    Args:
+        translator: deep-translator translator instance
+        texts: Strings to translate
+        translated_texts: List aligned with texts, filled in place with each
+            translation as it arrives (left None where translation failed)
+
+    Raises:
+        TooManyRequests or RequestError if the provider is still throttling or
+        unreachable after retries. Requests not yet sent are dropped; those
+        already in flight are waited for, so translated_texts holds everything
+        that was translated.
+    """
+    char_limit = _provider_setting(translator, BULK_CHAR_LIMITS, DEFAULT_BULK_CHAR_LIMIT)
+    workers = _provider_setting(translator, PROVIDER_WORKERS, DEFAULT_WORKERS)
+    groups = list(_bulk_groups(texts, char_limit))
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        def run(fn, items):
+            """Yield (item, fn(item)) in order; after a provider error, send nothing new and re-raise it."""
+            futures = [executor.submit(fn, item) for item in items]
+            error = None
+            for item, future in zip(items, futures):
+                if error is not None and future.cancel():
+                    continue  # Never sent
+                try:
+                    yield item, future.result()
+                except (TooManyRequests, RequestError) as e:
+                    error = error or e
+            if error is not None:
+                raise error
+
+        leftover = []
+        for group, batch_result in run(lambda group: _translate_group(translator, [texts[i] for i in group]),
+                                       groups):
+            if batch_result is None:
+                leftover.extend(group)
+            else:
+                for i, translated in zip(group, batch_result):
+                    translated_texts[i] = translated
+
+        if leftover:
+            debug_log(f"Translating {len(leftover)} texts individually ({workers} at a time)")
+            for i, translated in run(lambda i: _translate_one(translator, texts[i]), leftover):
+                translated_texts[i] = translated
+
+
+def _cache_key(translator, text: str) -> str:
+    """Cache key for text translated by translator: SHA1 of provider|source|target|text."""
+    key = f"{_provider_name(translator)}|{getattr(translator, 'source', '')}|{getattr(translator, 'target', '')}|{text}"
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+def _open_disk_cache():
+    """
+    Open the persistent translation cache, creating it on first use.
+
+    Returns:
+        sqlite3 connection, or None if the disk cache is disabled or unavailable.
+    """
+    global _DISK_CACHE
+    if _DISK_CACHE is None:
+        _DISK_CACHE = False
+        if os.environ.get("TRANSLATE_DISK_CACHE") == "0":
+            return None
+        try:
+            os.makedirs(os.path.dirname(DISK_CACHE_FILE), mode=0o700, exist_ok=True)
+            old_umask = os.umask(0o077)  # Cached email text is private to the user
+            try:
+                conn = sqlite3.connect(DISK_CACHE_FILE)
+            finally:
+                os.umask(old_umask)
+            conn.execute("CREATE TABLE IF NOT EXISTS translations (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            # Keep the file bounded: drop the oldest entries past the limit
+            conn.execute("DELETE FROM translations WHERE rowid <= "
+                         "(SELECT MAX(rowid) FROM translations) - ?", (DISK_CACHE_MAX_ROWS,))
+            conn.commit()
+            _DISK_CACHE = conn
+            debug_log(f"Opened translation cache {DISK_CACHE_FILE}")
+        except (sqlite3.Error, OSError) as e:
+            debug_log(f"Translation cache unavailable: {e}")
+    return _DISK_CACHE or None
+
+
+def translate_texts(translator, texts: list) -> list:
+    """
+    Translate a list of strings, reusing cached translations.
+
+    Duplicates are translated once; strings found in the disk cache are not
+    sent to the provider at all.
+
+    Args:
+        translator: deep-translator translator instance
+        texts: Strings to translate
+
+    Returns:
+        List of translations aligned with texts; the original string is kept
+        wherever translation failed.
+
+    Raises:
+        TooManyRequests or RequestError as _translate_uncached() does; the
+        strings translated before that are cached all the same.
+    """
+    unique = list(dict.fromkeys(texts))
+    keys = {text: _cache_key(translator, text) for text in unique}
+    translations = {}
+
+    disk_cache = _open_disk_cache()
+    missing = unique
+    if disk_cache is not None and missing:
+        by_key = {keys[text]: text for text in missing}
+        key_list = list(by_key)
+        try:
+            for i in range(0, len(key_list), 500):  # Stay under SQLite's parameter limit
+                chunk = key_list[i:i + 500]
+                rows = disk_cache.execute(
+                    f"SELECT key, value FROM translations WHERE key IN ({','.join('?' * len(chunk))})", chunk)
+                for key, value in rows:
+                    translations[by_key[key]] = value
+        except sqlite3.Error as e:
+            debug_log(f"Translation cache lookup failed: {e}")
+        missing = [text for text in missing if text not in translations]
+
+    debug_log(f"{len(texts)} texts, {len(unique)} unique, {len(missing)} not cached")
+
+    translated_texts = [None] * len(missing)
+    try:
+        if missing:
+            _translate_uncached(translator, missing, translated_texts)
+    finally:
+        # Also runs when the provider gave up partway: whatever was translated
+        # is stored, so trying again only sends the rest
+        fresh = {}
+        for text, translated in zip(missing, translated_texts):
+            translations[text] = translated or text  # Keep original on error
+            if translated and translated != text:  # Untranslated strings may be failures; retry next time
+                fresh[keys[text]] = translated
+
+        if fresh and disk_cache is not None:
+            try:
+                disk_cache.executemany("INSERT OR REPLACE INTO translations (key, value) VALUES (?, ?)",
+                                       fresh.items())
+                disk_cache.commit()
+            except sqlite3.Error as e:
+                debug_log(f"Translation cache update failed: {e}")
+
+    return [translations[text] for text in texts]
+
+
+def _pack(text: str, limit: int) -> list:
+    """
+    Split text into consecutive pieces of at most limit characters.
+
+    Pieces end at sentence or line boundaries, packing as many sentences into
+    each as fit; a single sentence longer than limit is cut at a space.
+    "".join() of the result gives back text.
+    """
+    pieces = []
+    start = 0
+    prev = 0
+    boundaries = [m.end() for m in _SENTENCE_END_RE.finditer(text)] + [len(text)]
+    for boundary in boundaries:
+        if boundary - start > limit and prev > start:
+            pieces.append(text[start:prev])
+            start = prev
+        while boundary - start > limit:
+            cut = text.rfind(" ", start + 1, start + limit)
+            cut = cut + 1 if cut > start else start + limit
+            pieces.append(text[start:cut])
+            start = cut
+        prev = boundary
+    if start < len(text):
+        pieces.append(text[start:])
+    return pieces
+
+
+def translate_long_text(translator, text: str) -> str:
+    """
+    Translate plain text longer than the provider accepts in one request.
+
+    The text is packed into sentence-aligned chunks just under the provider's
+    character limit, which are translated together and joined back up with
+    their original surrounding whitespace.
+    """
+    limit = _provider_setting(translator, BULK_CHAR_LIMITS, DEFAULT_BULK_CHAR_LIMIT)
+    chunks = []  # (leading whitespace, core, trailing whitespace)
+    for chunk in _pack(text, limit - CHUNK_MARGIN):
+        core = chunk.strip()
+        lead = len(chunk) - len(chunk.lstrip())
+        chunks.append((chunk[:lead], core, chunk[lead + len(core):]))
+    debug_log(f"Split {len(text)} chars into {len(chunks)} chunks of at most {limit - CHUNK_MARGIN}")
+
+    cores = [core for _, core, _ in chunks if core]
+    translations = iter(translate_texts(translator, cores))
+    return "".join(lead + (next(translations) if core else "") + trail for lead, core, trail in chunks)
 
 
 def translate_html_carefully(translator, html_content: str) -> str:
@@ -81,119 +747,53 @@ def translate_html_carefully(translator, html_content: str) -> str:
         Translated HTML with preserved structure
     """
     try:
-        from bs4 import BeautifulSoup, NavigableString, Comment, Doctype
-
-        # Try multiple parsers in order of preference: lxml > html5lib > html.parser
-        parser = None
-        for p in ['lxml', 'html5lib', 'html.parser']:
-            try:
-                soup = BeautifulSoup(html_content, p)
-                parser = p
-                debug_log(f"Using parser: {parser}")
-                break
-            except Exception:
-                continue
+        if not HAS_BS4:
+            raise ImportError("beautifulsoup4 is not installed")
 
-        if not parser:
-            soup = BeautifulSoup(html_content, 'html.parser')
-            parser = 'html.parser'
-            debug_log(f"Fallback to parser: {parser}")
+        soup = BeautifulSoup(html_content, HTML_PARSER)
+        debug_log(f"Using parser: {HTML_PARSER}")
 
-        # Collect all text nodes to translate in batch
+        # Phase 1: collect all text nodes; phase 2 translates them in batches.
+        # Nodes are only replaced after the walk, so iterating descendants is safe.
         texts_to_translate = []
-        nodes_to_update = []
+        nodes_to_update = []  # (node, leading, trailing) aligned with texts_to_translate
 
-        def collect_translatable_nodes(node):
-            """Recursively collect text nodes that need translation"""
-            if isinstance(node, NavigableString):
-                # Skip comments and doctypes
-                if isinstance(node, (Comment, Doctype)):
-                    return
-
-                text = str(node)
-                # Skip empty or whitespace-only text
-                if not text or text.isspace():
-                    return
-
-                # Skip very short text (likely structural like single spaces)
-                if len(text.strip()) < 2:
-                    return
-
-                # Skip numbers-only text
-                stripped = text.strip()
-                if stripped.replace(',', '').replace('.', '').replace(' ', '').isdigit():
-                    return
-
-                # Skip URLs and email addresses
-                if any(x in stripped.lower() for x in ['http://', 'https://', 'mailto:', '@']):
-                    return
+        for node in soup.descendants:
+            # Skip tags, comments, doctypes and CDATA, and code inside <script>/<style>
+            if not isinstance(node, NavigableString) or isinstance(node, PreformattedString):
+                continue
+            if node.parent is not None and node.parent.name in SKIP_TEXT_TAGS:
+                continue
 
-                # Collect this text for translation
-                texts_to_translate.append(stripped)
-                nodes_to_update.append({
-                    'node': node,
-                    'leading': text[:len(text) - len(text.lstrip())],
-                    'trailing': text[len(text.rstrip()):]
-                })
-            else:
-                # Recurse into child nodes
-                for child in list(node.children):
-                    collect_translatable_nodes(child)
+            text = str(node)
+            stripped = text.strip()
+            if _SKIP_TEXT_RE.fullmatch(stripped):
+                continue
 
-        # Collect all translatable text
-        collect_translatable_nodes(soup)
+            texts_to_translate.append(stripped)
+            nodes_to_update.append((node, text[:len(text) - len(text.lstrip())],
+                                    text[len(text.rstrip()):]))
 
         if not texts_to_translate:
             debug_log("No translatable text found")
-            return str(soup)
+            return html_content
 
         debug_log(f"Collected {len(texts_to_translate)} text nodes for translation")
 
-        # Translate in batches for efficiency
-        translated_texts = []
-        batch_size = 50  # Process 50 texts at a time
+        translated_texts = translate_texts(translator, texts_to_translate)
 
-        for i in range(0, len(texts_to_translate), batch_size):
-            batch = texts_to_translate[i:i + batch_size]
+        # Apply translations back to nodes
+        for (node, leading, trailing), original, translated in zip(
+                nodes_to_update, texts_to_translate, translated_texts):
             try:
-                # Try batch translation first (faster)
-                if hasattr(translator, 'translate_batch'):
-                    batch_result = translator.translate_batch(batch)
-                    translated_texts.extend(batch_result)
-                    debug_log(f"Batch translated {len(batch)} texts")
-                else:
-                    # Fallback to individual translation
-                    for text in batch:
-                        try:
-                            translated_texts.append(translator.translate(text))
-                        except Exception as e:
-                            debug_log(f"Translation error for '{text[:50]}': {e}")
-                            translated_texts.append(text)  # Keep original on error
+                node.replace_with(leading + translated + trailing)
+                debug_log("Translated: '%s' -> '%s'", original[:50], translated[:50])
             except Exception as e:
-                debug_log(f"Batch translation failed: {e}, falling back to individual")
-                # Fallback: translate individually
-                for text in batch:
-                    try:
-                        translated_texts.append(translator.translate(text))
-                    except Exception as e2:
-                        debug_log(f"Individual translation error for '{text[:50]}': {e2}")
-                        translated_texts.append(text)  # Keep original on error
-
-        # Apply translations back to nodes
-        for i, node_info in enumerate(nodes_to_update):
-            if i < len(translated_texts):
-                try:
-                    node = node_info['node']
-                    leading = node_info['leading']
-                    trailing = node_info['trailing']
-                    translated = translated_texts[i]
-
-                    node.replace_with(leading + translated + trailing)
-                    debug_log(f"Translated: '{texts_to_translate[i][:50]}' -> '{translated[:50]}'")
-                except Exception as e:
-                    debug_log(f"Failed to update node: {e}")
+                debug_log(f"Failed to update node: {e}")
 
         return str(soup)
+    except (TooManyRequests, RequestError):
+        raise  # Reported to the caller; a plain-text retry would be throttled as well
     except Exception as e:
         debug_log(f"HTML translation failed: {e}")
         import traceback
@@ -206,16 +806,79 @@ def translate_html_carefully(translator, html_content: str) -> str:
             return html_content  # Return original if all else fails
 
 
+def create_translator(provider: str, source_lang: str, target_lang: str, api_key: Optional[str] = None):
+    """
+    Create the deep-translator instance for a provider.
+
+    Args:
+        provider: Provider name (google, mymemory, libre)
+        source_lang: Source language code (or "auto")
+        target_lang: Target language code
+        api_key: Optional API key for providers that require it
+
+    Returns:
+        deep-translator translator instance
+
+    Raises:
+        ValueError: If the provider is unknown or cannot be set up
+    """
+    if provider == "google":
+        # Google Translate: Free, no API key, auto-detect supported
+        translator = GoogleTranslator(source=source_lang, target=target_lang)
+        debug_log("Using Google Translate (free, unlimited)")
+
+    elif provider == "mymemory":
+        # MyMemory: Free but limited (500 chars/request), requires email in API call
+        # Note: MyMemory API has been known to be unstable
+        try:
+            translator = MyMemoryTranslator(source=source_lang, target=target_lang)
+            debug_log("Using MyMemory Translator (free, 500 char limit)")
+        except Exception as e:
+            debug_log(f"MyMemory initialization error: {e}")
+            raise ValueError(f"MyMemory translator not available: {e}")
+
+    elif provider == "libre":
+        # LibreTranslate: Multiple public instances, some require API key
+        base_url = os.environ.get("LIBRE_TRANSLATE_URL", "https://libretranslate.de")
+        debug_log(f"Using LibreTranslate instance: {base_url}")
+
+        # Try with API key first, fallback to no key
+        try:
+            if api_key:
+                translator = LibreTranslator(source=source_lang, target=target_lang,
+                                            base_url=base_url, api_key=api_key)
+            else:
+                # Try without API key (some instances allow this)
+                translator = LibreTranslator(source=source_lang, target=target_lang,
+                                            base_url=base_url)
+            debug_log("LibreTranslate initialized successfully")
+        except Exception as e:
+            debug_log(f"LibreTranslate initialization error: {e}")
+            if "api" in str(e).lower() or "key" in str(e).lower():
+                raise ValueError(
+                    f"LibreTranslate requires API key for {base_url}. "
+                    "Try a different instance URL via LIBRE_TRANSLATE_URL environment variable "
+                    "(e.g., https://libretranslate.de or https://translate.argosopentech.com)"
+                )
+            raise
+
+    else:
+        raise ValueError(f"Unsupported provider: {provider}. Supported: google, libre")
+
+    return translator
+
+
 def translate_online(
     text: str,
     target_lang: str,
     provider: str,
     is_html: bool = False,
-    api_key: Optional[str] = None
+    api_key: Optional[str] = None,
+    fallback_providers: Optional[list] = None
 ) -> dict:
     """
     Translate text using the specified online provider via deep-translator.
-    Implements retry logic for network issues and rate limiting.
+    Individual requests are rate-limited and retried (see _call_provider).
 
     Args:
         text: Text to translate
@@ -223,24 +886,21 @@ def translate_online(
         provider: Provider name (google, mymemory, libre, etc.)
         is_html: Whether input is HTML
         api_key: Optional API key for providers that require it
+        fallback_providers: Providers to use while `provider` is rate-limited
 
     Returns:
         Dict with "translated" key containing translated text, and optional "error" key
     """
-    import time
+    if DEEP_TRANSLATOR_IMPORT_ERROR is not None:
+        error_msg = (f"Required library not installed: {DEEP_TRANSLATOR_IMPORT_ERROR}. "
+                     "Please run: pip install deep-translator")
+        debug_log(f"Import error: {error_msg}")
+        return {"error": error_msg, "translated": text}
 
     try:
-        from deep_translator import GoogleTranslator, MyMemoryTranslator, LibreTranslator
-        from deep_translator.exceptions import (
-            NotValidPayload,
-            TranslationNotFound,
-            RequestError,
-            TooManyRequests,
-        )
+        use_shared_session()
     except ImportError as e:
-        error_msg = f"Required library not installed: {e}. Please run: pip install deep-translator"
-        debug_log(f"Import error: {error_msg}")
-        return {"error": error_msg, "translated": text}
+        debug_log(f"Shared HTTP session unavailable: {e}")
 
     debug_log(f"Translating with provider: {provider}")
     debug_log(f"Target language: {target_lang}")
@@ -253,112 +913,62 @@ def translate_online(
         return {"translated": text}
 
     try:
+        # Messages that need no translation are never parsed as HTML
+        sample = detection_sample(text, is_html)
+
+        # Fast exit for text that is obviously English already: skips langdetect
+        if target_lang == "en" and looks_like_english(sample):
+            debug_log("Input looks like English already, no translation needed")
+            return {"translated": text}
+
         # Detect source language
-        source_lang = detect_language(text, is_html)
+        source_lang = detect_language(sample)
         debug_log(f"Detected source language: {source_lang}")
 
         if source_lang == target_lang:
             debug_log("Source and target languages are the same, returning input")
             return {"translated": text}
 
-        # Create appropriate translator instance based on provider
-        translator = None
-
-        if provider == "google":
-            # Google Translate: Free, no API key, auto-detect supported
-            translator = GoogleTranslator(source=source_lang, target=target_lang)
-            debug_log("Using Google Translate (free, unlimited)")
+        translator = create_translator(provider, source_lang, target_lang, api_key)
 
-        elif provider == "mymemory":
-            # MyMemory: Free but limited (500 chars/request), requires email in API call
-            # Note: MyMemory API has been known to be unstable
+        # Optional fallbacks for while the requested provider is rate-limited
+        fallbacks = []
+        for name in fallback_providers or []:
+            if name == provider:
+                continue
             try:
-                translator = MyMemoryTranslator(source=source_lang, target=target_lang)
-                debug_log("Using MyMemory Translator (free, 500 char limit)")
+                fallbacks.append(create_translator(name, source_lang, target_lang))
             except Exception as e:
-                debug_log(f"MyMemory initialization error: {e}")
-                raise ValueError(f"MyMemory translator not available: {e}")
+                debug_log(f"Fallback provider {name} unavailable: {e}")
+        if fallbacks:
+            translator = _ProviderChain([translator] + fallbacks)
 
-        elif provider == "libre":
-            # LibreTranslate: Multiple public instances, some require API key
-            base_url = os.environ.get("LIBRE_TRANSLATE_URL", "https://libretranslate.de")
-            debug_log(f"Using LibreTranslate instance: {base_url}")
-
-            # Try with API key first, fallback to no key
-            try:
-                if api_key:
-                    translator = LibreTranslator(source=source_lang, target=target_lang,
-                                                base_url=base_url, api_key=api_key)
-                else:
-                    # Try without API key (some instances allow this)
-                    translator = LibreTranslator(source=source_lang, target=target_lang,
-                                                base_url=base_url)
-                debug_log("LibreTranslate initialized successfully")
-            except Exception as e:
-                debug_log(f"LibreTranslate initialization error: {e}")
-                if "api" in str(e).lower() or "key" in str(e).lower():
-                    raise ValueError(
-                        f"LibreTranslate requires API key for {base_url}. "
-                        "Try a different instance URL via LIBRE_TRANSLATE_URL environment variable "
-                        "(e.g., https://libretranslate.de or https://translate.argosopentech.com)"
-                    )
-                raise
+        debug_log(f"Translator created: {_provider_name(translator)}")
 
+        # Translate based on content type
+        if is_html:
+            translated = translate_html_carefully(translator, text)
         else:
-            raise ValueError(f"Unsupported provider: {provider}. Supported: google, libre")
-
-        debug_log(f"Translator created: {type(translator).__name__}")
-
-        # Retry configuration
-        max_retries = 3
-        retry_delay = 1  # seconds
-
-        for attempt in range(max_retries):
-            try:
-                # Translate based on content type
-                if is_html:
-                    translated = translate_html_carefully(translator, text)
-                else:
-                    # For plain text, handle provider-specific limits
-                    if provider == "mymemory" and len(text) > 500:
-                        # MyMemory has 500 char limit, split into sentences
-                        debug_log("Splitting text for MyMemory (500 char limit)")
-                        sentences = text.split('. ')
-                        translated_sentences = []
-                        for sentence in sentences:
-                            if sentence.strip():
-                                translated_sentences.append(translator.translate(sentence.strip()))
-                                time.sleep(0.5)  # Rate limiting
-                        translated = '. '.join(translated_sentences)
-                    else:
-                        translated = translator.translate(text)
-
-                debug_log(f"Translation successful, output length: {len(translated)} chars")
-                return {"translated": translated}
+            # For plain text, stay within the provider's per-request limit
+            # (e.g. 500 chars for MyMemory)
+            if len(text) > _provider_setting(translator, BULK_CHAR_LIMITS, DEFAULT_BULK_CHAR_LIMIT):
+                translated = translate_long_text(translator, text)
+            else:
+                translated = _call_provider(translator, text)
 
-            except TooManyRequests as e:
-                debug_log(f"Rate limit hit (attempt {attempt + 1}/{max_retries}): {e}")
-                if attempt < max_retries - 1:
-                    wait_time = retry_delay * (2 ** attempt)  # Exponential backoff
-                    debug_log(f"Waiting {wait_time}s before retry...")
-                    time.sleep(wait_time)
-                else:
-                    raise
-
-            except RequestError as e:
-                debug_log(f"Network error (attempt {attempt + 1}/{max_retries}): {e}")
-                if attempt < max_retries - 1:
-                    wait_time = retry_delay * (2 ** attempt)
-                    debug_log(f"Waiting {wait_time}s before retry...")
-                    time.sleep(wait_time)
-                else:
-                    raise
+        debug_log(f"Translation successful, output length: {len(translated)} chars")
+        return {"translated": translated}
 
     except NotValidPayload as e:
         error_msg = f"Invalid input for translation: {e}"
         debug_log(f"Validation error: {error_msg}")
         return {"error": error_msg, "translated": text}
 
+    except TooManyRequests as e:
+        error_msg = f"Rate limited by provider, try again later: {e}"
+        debug_log(f"Rate limited: {error_msg}")
+        return {"error": error_msg, "translated": text}
+
     except TranslationNotFound as e:
         error_msg = f"Translation not found: {e}"
         debug_log(f"Translation not found: {error_msg}")
@@ -379,8 +989,6 @@ def translate_online(
 
 def main():
     """Main entry point for the online translation runner"""
-    global DEBUG_MODE
-
     parser = argparse.ArgumentParser(description="Online translation runner using deep-translator")
     parser.add_argument("--target", default="en", help="Target language code (ISO 639-1)")
     parser.add_argument("--provider", default="google", help="Translation provider (google, mymemory, libre)")
@@ -388,13 +996,15 @@ def main():
     parser.add_argument("--text", dest="is_html", action="store_false", help="Input is plain text")
     parser.add_argument("--debug", action="store_true", help="Enable debug logging")
     parser.add_argument("--api-key", help="API key for providers that require it")
+    parser.add_argument("--fallback-providers", default=os.environ.get(FALLBACK_PROVIDERS_ENV, ""),
+                        help="Comma-separated providers to use while --provider is rate-limited "
+                             f"(default: ${FALLBACK_PROVIDERS_ENV}, none)")
     parser.set_defaults(is_html=False)
 
     args = parser.parse_args()
 
-    DEBUG_MODE = args.debug
-
-    if DEBUG_MODE:
+    if args.debug:
+        enable_debug_logging()
         debug_log("=" * 60)
         debug_log(f"Online translation runner started")
         debug_log(f"Provider: {args.provider}")
@@ -405,7 +1015,7 @@ def main():
     input_text = sys.stdin.read()
 
     if not input_text:
-        print(json.dumps({"error": "No input provided", "translated": ""}))
+        write_json({"error": "No input provided", "translated": ""})
         return 1
 
     # Perform translation
@@ -414,11 +1024,12 @@ def main():
         target_lang=args.target,
         provider=args.provider,
         is_html=args.is_html,
-        api_key=args.api_key
+        api_key=args.api_key,
+        fallback_providers=[p.strip() for p in args.fallback_providers.split(",") if p.strip()]
     )
 
     # Output result as JSON
-    print(json.dumps(result))
+    write_json(result)
 
     if DEBUG_MODE:
         debug_log("Translation complete")